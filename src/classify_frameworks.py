@@ -1,10 +1,15 @@
 # classify_frameworks.py
 
 import os
+import pickle
+import multiprocessing as mp
 import networkx as nx
+import numpy as np
 import pandas as pd
+from scipy.sparse.csgraph import connected_components
 from tqdm import tqdm
 
+from util.af_files import iter_af_files
 from util.af_parser import parse_af_file
 
 # --- Configuration ---
@@ -14,6 +19,10 @@ BENCHMARK_DIRS = [
 ]
 RESULTS_DIR = os.path.join("data", "results")
 OUTPUT_CSV = os.path.join("data", "framework_properties.csv")
+CACHE_PATH = os.path.join("data", "framework_properties.cache.pkl")
+# Cached in place of the record of an empty or unreadable framework, so that
+# it is not parsed again until the file changes.
+NO_RECORD = {}
 
 # --- Helper Functions ---
 
@@ -24,10 +33,7 @@ def find_framework_files(root_dirs: list) -> list:
         if not os.path.exists(root_dir):
             print(f"Warning: Benchmark directory not found at '{root_dir}'")
             continue
-        for dirpath, _, filenames in os.walk(root_dir):
-            for filename in filenames:
-                if filename.endswith(".af"):
-                    framework_paths.append(os.path.join(dirpath, filename))
+        framework_paths.extend(iter_af_files(root_dir))
     return sorted(framework_paths)
 
 def get_framework_properties(af: nx.DiGraph) -> dict:
@@ -37,30 +43,105 @@ def get_framework_properties(af: nx.DiGraph) -> dict:
 
     properties = {}
     
-    # 1. Cyclicity
-    properties['cyclicity'] = "Cyclic" if not nx.is_directed_acyclic_graph(af) else "Acyclic"
+    # Cyclicity and connectivity are both read off component labellings of one
+    # sparse adjacency matrix, computed in C instead of two NetworkX traversals.
+    adj_matrix = nx.to_scipy_sparse_array(af, format='csr')
     
-    # 2. Size
-    if num_nodes < 25: properties['size_group'] = "Small"
-    elif 25 <= num_nodes <= 75: properties['size_group'] = "Medium"
-    else: properties['size_group'] = "Large"
-
-    # 3. Density
+    # 1. Cyclicity: a cycle exists iff some strongly connected component has
+    # more than one argument or an argument attacks itself.
+    num_strong_components, _ = connected_components(adj_matrix, directed=True, connection='strong')
+    is_cyclic = num_strong_components < num_nodes or nx.number_of_selfloops(af) > 0
+    properties['cyclicity'] = "Cyclic" if is_cyclic else "Acyclic"
+    
+    # 2. Density (the size and density groups are binned for all frameworks
+    # at once in main)
     num_edges = af.number_of_edges()
     max_edges = num_nodes * (num_nodes - 1)
     density = num_edges / max_edges if max_edges > 0 else 0
     properties['density_value'] = density
-    if density < 0.05: properties['density_group'] = "Sparse"
-    elif 0.05 <= density <= 0.15: properties['density_group'] = "Medium"
-    else: properties['density_group'] = "Dense"
 
-    # 4. Connectivity
-    num_components = nx.number_weakly_connected_components(af)
+    # 3. Connectivity
+    num_components, _ = connected_components(adj_matrix, directed=True, connection='weak')
     properties['connectivity'] = "Connected" if num_components == 1 else "Disconnected"
     properties['num_components'] = num_components
     
     return properties
 
+def classify_framework(af_path: str) -> dict:
+    """
+    Parses a single AF and computes its structural properties.
+    Returns None if the framework is empty or unreadable.
+    """
+    try:
+        # --- Get Structural Properties ---
+        af = parse_af_file(af_path)
+        properties = get_framework_properties(af)
+        
+        if not properties: return None
+
+        return {
+            'framework_name': os.path.basename(af_path),
+            'source_dataset': "tweety" if "benchmarks_tweety" in af_path else "iccma23",
+            'num_args': af.number_of_nodes(),
+            'num_attacks': af.number_of_edges(),
+            **properties
+        }
+
+    except Exception as e:
+        print(f"Could not process {os.path.basename(af_path)}: {e}")
+        return None
+
+def get_processing_status(framework_name: str, result_files: set) -> str:
+    """Looks up the processing status of a framework in a listing of RESULTS_DIR."""
+    base_name_no_ext = framework_name.replace('.af', '')
+    if f"{base_name_no_ext}.timeout" in result_files:
+        return "Timed Out"
+    if f"{base_name_no_ext}_kendall.csv" in result_files and f"{base_name_no_ext}_spearman.csv" in result_files:
+        return "Processed"
+    return "Not Processed"
+
+def add_size_and_density_groups(properties_df: pd.DataFrame):
+    """
+    Bins every framework into its size and density group in two vectorized
+    pd.cut calls. Size groups: Small (< 25 arguments), Medium (25-75) and
+    Large (> 75). Density groups: Sparse (< 0.05), Medium (0.05-0.15) and
+    Dense (> 0.15).
+    """
+    size_groups = pd.cut(
+        properties_df['num_args'], bins=[-np.inf, 24, 75, np.inf],
+        labels=["Small", "Medium", "Large"]
+    )
+    # Bins are closed on the left so that 0.05 counts as Medium; nudging the
+    # upper edge past 0.15 keeps 0.15 itself Medium as well.
+    density_groups = pd.cut(
+        properties_df['density_value'], bins=[-np.inf, 0.05, np.nextafter(0.15, np.inf), np.inf],
+        labels=["Sparse", "Medium", "Dense"], right=False
+    )
+    # Both columns go where the per-framework classification used to put them.
+    properties_df.insert(properties_df.columns.get_loc('density_value'), 'size_group', size_groups)
+    properties_df.insert(properties_df.columns.get_loc('density_value') + 1, 'density_group', density_groups)
+
+def get_cache_key(af_path: str) -> tuple:
+    """Identifies one version of a framework file by its path, mtime and size."""
+    st = os.stat(af_path)
+    return (af_path, st.st_mtime_ns, st.st_size)
+
+def load_properties_cache(cache_path: str) -> dict:
+    """Loads the cached framework records, or an empty cache if there is none."""
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"Warning: Could not read properties cache. Rebuilding it. Reason: {e}")
+        return {}
+
+def save_properties_cache(cache: dict, cache_path: str):
+    """Writes the framework record cache next to the output CSV."""
+    with open(cache_path, 'wb') as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+
 # --- Main Execution Logic ---
 
 def main():
@@ -79,45 +160,46 @@ def main():
 
     print(f"\nFound {len(framework_paths)} frameworks to classify and check...")
     
+    # A single listing of the results directory replaces three existence
+    # checks per framework.
+    result_files = set(os.listdir(RESULTS_DIR)) if os.path.isdir(RESULTS_DIR) else set()
+
+    # Structural properties only change when a file does, so frameworks whose
+    # path, mtime and size match the cache are not parsed again.
+    cache = load_properties_cache(CACHE_PATH)
+    cache_keys = [get_cache_key(af_path) for af_path in framework_paths]
+    uncached_paths = [af_path for af_path, key in zip(framework_paths, cache_keys) if key not in cache]
+    print(f"Reusing cached properties for {len(framework_paths) - len(uncached_paths)} frameworks.")
+
+    # Every framework is classified independently, so the work is spread over
+    # all cores. imap (rather than imap_unordered) keeps the records in the
+    # same order as the paths.
+    new_records = {}
+    if uncached_paths:
+        with mp.Pool(mp.cpu_count()) as pool:
+            records = pool.imap(classify_framework, uncached_paths, chunksize=8)
+            for af_path, record in zip(uncached_paths, tqdm(records, total=len(uncached_paths), desc="Classifying")):
+                new_records[af_path] = record
+
+    # Rebuilding the cache from the current files also drops deleted ones.
+    updated_cache = {}
     all_properties_data = []
-    for af_path in tqdm(framework_paths, desc="Classifying and Checking Status"):
-        try:
-            # --- Get Structural Properties ---
-            af = parse_af_file(af_path)
-            properties = get_framework_properties(af)
-            
-            if not properties: continue
-
-            base_name = os.path.basename(af_path)
-            record = {
-                'framework_name': base_name,
-                'source_dataset': "tweety" if "benchmarks_tweety" in af_path else "iccma23",
-                'num_args': af.number_of_nodes(),
-                'num_attacks': af.number_of_edges(),
-                **properties
-            }
-            
-            # --- Check Processing Status ---
-            status = "Not Processed" # Default status
-            base_name_no_ext = base_name.replace('.af', '')
-            
-            timeout_marker_path = os.path.join(RESULTS_DIR, f"{base_name_no_ext}.timeout")
-            kendall_path = os.path.join(RESULTS_DIR, f"{base_name_no_ext}_kendall.csv")
-            spearman_path = os.path.join(RESULTS_DIR, f"{base_name_no_ext}_spearman.csv")
-            
-            if os.path.exists(timeout_marker_path):
-                status = "Timed Out"
-            elif os.path.exists(kendall_path) and os.path.exists(spearman_path):
-                status = "Processed"
-            
-            record['status'] = status
-            all_properties_data.append(record)
-
-        except Exception as e:
-            print(f"Could not process {os.path.basename(af_path)}: {e}")
+    for af_path, key in zip(framework_paths, cache_keys):
+        record = cache[key] if key in cache else new_records[af_path]
+        updated_cache[key] = NO_RECORD if record is None else record
+        # Frameworks without a record (cached as NO_RECORD) are not listed.
+        if not record:
+            continue
+        # The status changes between runs, so it is never cached.
+        all_properties_data.append({
+            **record,
+            'status': get_processing_status(record['framework_name'], result_files)
+        })
+    save_properties_cache(updated_cache, CACHE_PATH)
     
     # --- Save the combined data ---
     properties_df = pd.DataFrame(all_properties_data)
+    add_size_and_density_groups(properties_df)
     properties_df.to_csv(OUTPUT_CSV, index=False)
     
     print(f"\nClassification complete.")
@@ -3,6 +3,7 @@
 import os
 import itertools
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
 
@@ -36,52 +37,76 @@ def format_report_for_group(kendall_data: dict, spearman_data: dict, title: str,
         f"{title} (Fast-vs-Fast on {count_all} AFs, others on {count_tweety} Tweety AFs)"
     )
 
-    def build_matrix_string(data: dict, metric_title: str, agg_func) -> str:
-        """Builds a CSV matrix string for a given aggregation function."""
-        matrix = pd.DataFrame(index=semantics_list, columns=semantics_list, dtype=float)
-        for n1, n2 in itertools.product(semantics_list, semantics_list):
-            if n1 == n2:
-                if agg_func in [np.mean, np.median]:
-                    matrix.loc[n1, n2] = 1.0
-                else: # np.std
-                    matrix.loc[n1, n2] = 0.0
-            else:
-                corrs = data.get((n1, n2), []) or data.get((n2, n1), [])
-                if corrs:
-                    matrix.loc[n1, n2] = agg_func(corrs)
-        return f"--- {metric_title} ---\n{matrix.to_csv()}\n"
-
-    report_parts.append(build_matrix_string(kendall_data, f"{report_title} - Kendall's Tau (Average)", np.mean))
-    report_parts.append(build_matrix_string(kendall_data, f"{report_title} - Kendall's Tau (Median)", np.median))
-    report_parts.append(build_matrix_string(kendall_data, f"{report_title} - Kendall's Tau (Standard Deviation)", np.std))
-    report_parts.append(build_matrix_string(spearman_data, f"{report_title} - Spearman's Rho (Average)", np.mean))
-    report_parts.append(build_matrix_string(spearman_data, f"{report_title} - Spearman's Rho (Median)", np.median))
-    report_parts.append(build_matrix_string(spearman_data, f"{report_title} - Spearman's Rho (Standard Deviation)", np.std))
+    def build_statistic_matrices(data: dict) -> tuple:
+        """Computes the mean, median and standard deviation matrices in a single pass over the pairs."""
+        size = len(semantics_list)
+        means, medians, stds = (np.full((size, size), np.nan) for _ in range(3))
+        np.fill_diagonal(means, 1.0)
+        np.fill_diagonal(medians, 1.0)
+        np.fill_diagonal(stds, 0.0)
+        for (i, n1), (j, n2) in itertools.permutations(enumerate(semantics_list), 2):
+            corrs = data.get((n1, n2), []) or data.get((n2, n1), [])
+            if corrs:
+                means[i, j] = np.mean(corrs)
+                medians[i, j] = np.median(corrs)
+                stds[i, j] = np.std(corrs)
+        return means, medians, stds
+
+    def build_matrix_string(matrix: np.ndarray, metric_title: str) -> str:
+        """Builds a CSV matrix string for a precomputed statistic matrix."""
+        matrix_df = pd.DataFrame(matrix, index=semantics_list, columns=semantics_list)
+        return f"--- {metric_title} ---\n{matrix_df.to_csv()}\n"
+
+    for data, metric_name in ((kendall_data, "Kendall's Tau"), (spearman_data, "Spearman's Rho")):
+        means, medians, stds = build_statistic_matrices(data)
+        report_parts.append(build_matrix_string(means, f"{report_title} - {metric_name} (Average)"))
+        report_parts.append(build_matrix_string(medians, f"{report_title} - {metric_name} (Median)"))
+        report_parts.append(build_matrix_string(stds, f"{report_title} - {metric_name} (Standard Deviation)"))
     
     return "\n".join(report_parts)
 
+def read_result_matrices(framework_name: str):
+    """Reads the Kendall and Spearman result matrices of a framework, or returns None if unavailable."""
+    kendall_path = os.path.join(RESULTS_DIR, framework_name.replace('.af', '_kendall.csv'))
+    spearman_path = os.path.join(RESULTS_DIR, framework_name.replace('.af', '_spearman.csv'))
+    if not (os.path.exists(kendall_path) and os.path.exists(spearman_path)):
+        return None
+    try:
+        return pd.read_csv(kendall_path, index_col=0), pd.read_csv(spearman_path, index_col=0)
+    except Exception as e:
+        print(f"Warning: Could not read result for {framework_name}. Reason: {e}")
+        return None
+
 def aggregate_correlations(frameworks_df: pd.DataFrame) -> (dict, dict, int):
     """Reads result files for a given set of frameworks and aggregates the correlations."""
     kendall_agg = defaultdict(list)
     spearman_agg = defaultdict(list)
     processed_count = 0
-    for _, row in frameworks_df.iterrows():
-        framework_name = row['framework_name']
-        kendall_path = os.path.join(RESULTS_DIR, framework_name.replace('.af', '_kendall.csv'))
-        spearman_path = os.path.join(RESULTS_DIR, framework_name.replace('.af', '_spearman.csv'))
-        
-        if os.path.exists(kendall_path) and os.path.exists(spearman_path):
-            processed_count += 1
+    framework_names = frameworks_df['framework_name'].to_numpy()
+
+    # Reading the result CSVs is I/O-bound, so the files are loaded by a thread
+    # pool while the correlations are aggregated in framework order.
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for framework_name, matrices in zip(framework_names, executor.map(read_result_matrices, framework_names)):
+            if matrices is None:
+                continue
+            df_k, df_s = matrices
             try:
-                df_k = pd.read_csv(kendall_path, index_col=0)
-                df_s = pd.read_csv(spearman_path, index_col=0)
-                for (c1, c2) in itertools.combinations(df_k.columns, 2):
-                    if c1 in df_k.index and c2 in df_k.index:
-                        kendall_agg[(c1, c2)].append(df_k.loc[c1, c2])
-                        spearman_agg[(c1, c2)].append(df_s.loc[c1, c2])
+                # Gather the upper triangle of both matrices in one indexing step
+                # instead of a label lookup per semantics pair.
+                columns = df_k.columns
+                row_positions = df_k.index.get_indexer(columns)
+                i_idx, j_idx = np.triu_indices(len(columns), k=1)
+                present = (row_positions[i_idx] >= 0) & (row_positions[j_idx] >= 0)
+                i_idx, j_idx = i_idx[present], j_idx[present]
+                kendall_values = df_k.to_numpy()[row_positions[i_idx], j_idx]
+                spearman_values = df_s.reindex(index=df_k.index, columns=columns).to_numpy()[row_positions[i_idx], j_idx]
+                for c1, c2, k_val, s_val in zip(columns[i_idx], columns[j_idx], kendall_values, spearman_values):
+                    kendall_agg[(c1, c2)].append(k_val)
+                    spearman_agg[(c1, c2)].append(s_val)
+                processed_count += 1
             except Exception as e:
                 print(f"Warning: Could not read result for {framework_name}. Reason: {e}")
-                processed_count -= 1
     return kendall_agg, spearman_agg, processed_count
 
 # --- Main Analysis Logic ---
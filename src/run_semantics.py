@@ -2,15 +2,23 @@
 
 import os
 import time
+import signal
 import multiprocessing as mp
-import itertools
-from collections import defaultdict
+import multiprocessing.connection
+from concurrent.futures import ThreadPoolExecutor
 
 import networkx as nx
+import numpy as np
 import pandas as pd
-from scipy.stats import kendalltau, spearmanr
+from scipy.sparse import csr_array
 
-from util.af_parser import parse_af_file
+try:
+    import numba
+except ImportError:
+    numba = None
+
+from util.af_files import iter_af_files
+from util.af_parser import parse_af_edges
 from semantics.cat import Cat
 from semantics.dbs import Dbs
 from semantics.ser import Ser
@@ -28,6 +36,8 @@ BENCHMARK_DIRS = [
     os.path.join("data", "benchmarks2023", "main")
 ]
 RESULTS_DIR = os.path.join("data", "results")
+# Parsed frameworks are cached here, in a tree mirroring their paths below data/.
+PARSE_CACHE_DIR = os.path.join("data", "parse_cache")
 TIMEOUT_SECONDS = 600
 
 FAST_SEMANTICS = {
@@ -44,30 +54,197 @@ SLOW_SEMANTICS = {
     "p-Preferred": ProbPreferred
 }
 
+ALL_SEMANTICS = {**FAST_SEMANTICS, **SLOW_SEMANTICS}
+
+# Imported once in the forkserver so that every worker process forked from it
+# starts with them loaded. '__main__' keeps the default preload of the script.
+FORKSERVER_PRELOAD = [
+    '__main__', 'networkx', 'numpy', 'scipy.sparse', 'pandas',
+    'util.af_parser', 'semantics.cat', 'semantics.dbs', 'semantics.ser',
+    'semantics.prob.prob_admissible', 'semantics.prob.prob_complete',
+    'semantics.prob.prob_grounded', 'semantics.prob.prob_ideal',
+    'semantics.prob.prob_preferred', 'semantics.prob.prob_stable'
+]
+
 # --- Worker for Multiprocessing Timeout ---
 
-def semantics_worker(name: str, sem_class, af: nx.DiGraph, queue: mp.Queue):
-    """A generic worker to run any semantics calculation in a separate process."""
+# Semantics that accept a precomputed transposed adjacency matrix.
+MATRIX_SEMANTICS = (Cat, Dbs)
+
+# How long the parent waits past TIMEOUT_SECONDS before it terminates a worker
+# whose semantics did not report back, giving the in-worker alarm time to fire.
+TIMEOUT_GRACE_SECONDS = 5
+
+class SemanticsTimeout(BaseException):
+    """
+    Raised inside a worker when a semantics exceeds TIMEOUT_SECONDS. It is not
+    an Exception, so broad exception handlers in the semantics or their
+    dependencies cannot swallow it.
+    """
+
+def _raise_timeout(signum, frame):
+    raise SemanticsTimeout()
+
+def init_worker(num_threads: int = 1):
+    """
+    Installs the SIGALRM handler that reports a semantics exceeding
+    TIMEOUT_SECONDS from within the worker, and limits numba's parallel
+    kernels to this worker's share of cores.
+    """
+    signal.signal(signal.SIGALRM, _raise_timeout)
+    if numba is not None:
+        numba.set_num_threads(max(1, min(num_threads, numba.config.NUMBA_NUM_THREADS)))
+
+def run_framework_task(task: tuple, conn) -> None:
+    """
+    Runs all requested semantics on one framework inside a worker process, so
+    the framework is parsed and its adjacency matrix built only once.
+    Sends ('loaded', all_args_sorted) over conn once the framework is parsed,
+    or ('failed', message) if it cannot be, and then (name, status, payload,
+    elapsed) for each semantics as soon as it finishes. The status is 'done'
+    (payload is the int32 position of every argument in the normalized
+    ranking), 'timeout' or 'error' (payload is the error message).
+    After a timeout the remaining semantics are skipped, as the framework is
+    then marked as timed out anyway.
+    """
+    framework_path, semantics_names = task
     try:
-        calculator = sem_class(af)
-        if hasattr(calculator, 'get_scores'):
-            result = calculator.get_scores()
-        elif hasattr(calculator, 'get_ranking'):
-            result = calculator.get_ranking()
-        else:
-            raise NotImplementedError(f"Semantics class {name} has no get_scores or get_ranking method.")
-        queue.put(result)
+        af, all_args_sorted, precomputed = load_framework(framework_path)
     except Exception as e:
-        queue.put(e)
+        conn.send(('failed', f"Could not parse file: {e}"))
+        return
+    conn.send(('loaded', all_args_sorted))
+
+    for name in semantics_names:
+        sem_class = ALL_SEMANTICS[name]
+        start_time = time.time()
+        try:
+            signal.alarm(TIMEOUT_SECONDS)
+            try:
+                result = semantics_worker(name, sem_class, af, precomputed if sem_class in MATRIX_SEMANTICS else None)
+            finally:
+                signal.alarm(0)
+            ranking = normalize_ranking(result, all_args_sorted)
+            conn.send((name, 'done', ranking_positions(ranking, precomputed['arg_to_index']), time.time() - start_time))
+        except SemanticsTimeout:
+            conn.send((name, 'timeout', None, time.time() - start_time))
+            return
+        except Exception as e:
+            conn.send((name, 'error', str(e), time.time() - start_time))
+
+def _framework_process(task: tuple, conn, num_threads: int):
+    """Entry point of the worker process that runs one framework."""
+    init_worker(num_threads)
+    try:
+        run_framework_task(task, conn)
+    finally:
+        conn.close()
+
+def run_frameworks(tasks: list, num_workers: int, threads_per_worker: int):
+    """
+    Runs every task in its own worker process, at most num_workers at a time,
+    and yields (framework_path, all_args_sorted, results) as frameworks finish,
+    where results maps each semantics name to (status, payload, elapsed).
+    The parent enforces the timeout: a worker that reports nothing for
+    TIMEOUT_SECONDS plus TIMEOUT_GRACE_SECONDS is terminated, which also stops
+    compiled kernels and SAT calls that the in-worker SIGALRM cannot interrupt.
+    """
+    ctx = mp.get_context('forkserver')
+    ctx.set_forkserver_preload(FORKSERVER_PRELOAD)
+    pending = list(reversed(tasks))
+    # The receiving end of each running worker's pipe, mapped to its state.
+    running = {}
+    try:
+        while pending or running:
+            while pending and len(running) < num_workers:
+                framework_path, semantics_names = pending.pop()
+                receiver, sender = ctx.Pipe(duplex=False)
+                process = ctx.Process(target=_framework_process,
+                                      args=((framework_path, semantics_names), sender, threads_per_worker))
+                process.start()
+                sender.close()
+                running[receiver] = {
+                    'process': process, 'framework_path': framework_path,
+                    'semantics_names': semantics_names, 'all_args_sorted': [], 'results': {},
+                    'last_report': time.time()
+                }
+
+            finished = []
+            next_deadline = min(run['last_report'] for run in running.values()) + TIMEOUT_SECONDS + TIMEOUT_GRACE_SECONDS
+            for receiver in mp.connection.wait(list(running), max(0.0, next_deadline - time.time())):
+                run = running[receiver]
+                results = run['results']
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    # The worker died without reporting its remaining semantics.
+                    run['process'].join()
+                    for name in run['semantics_names']:
+                        results.setdefault(name, ('error', f"Worker exited with code {run['process'].exitcode}", 0.0))
+                    finished.append(receiver)
+                    continue
+                run['last_report'] = time.time()
+                if message[0] == 'failed':
+                    results.update({name: ('error', message[1], 0.0) for name in run['semantics_names']})
+                elif message[0] == 'loaded':
+                    run['all_args_sorted'] = message[1]
+                else:
+                    name, status, payload, elapsed = message
+                    results[name] = (status, payload, elapsed)
+                    if status == 'timeout':
+                        finished.append(receiver)
+                        continue
+                if len(results) == len(run['semantics_names']):
+                    finished.append(receiver)
+
+            now = time.time()
+            for receiver, run in running.items():
+                if receiver not in finished and now >= run['last_report'] + TIMEOUT_SECONDS + TIMEOUT_GRACE_SECONDS:
+                    run['process'].terminate()
+                    # The first semantics that did not report back is the one that hung.
+                    name = next(name for name in run['semantics_names'] if name not in run['results'])
+                    run['results'][name] = ('timeout', None, now - run['last_report'])
+                    finished.append(receiver)
+
+            for receiver in finished:
+                run = running.pop(receiver)
+                run['process'].join()
+                receiver.close()
+                yield run['framework_path'], run['all_args_sorted'], run['results']
+    finally:
+        for run in running.values():
+            run['process'].terminate()
+            run['process'].join()
+
+def semantics_worker(name: str, sem_class, af: nx.DiGraph, precomputed: dict = None):
+    """A generic worker to run any semantics calculation inside the worker pool."""
+    if precomputed is not None:
+        calculator = sem_class(af, precomputed=precomputed)
+    else:
+        calculator = sem_class(af)
+    if hasattr(calculator, 'get_scores'):
+        return calculator.get_scores()
+    if hasattr(calculator, 'get_ranking'):
+        return calculator.get_ranking()
+    raise NotImplementedError(f"Semantics class {name} has no get_scores or get_ranking method.")
 
 # --- Ranking Normalization ---
 
 def normalize_ranking(result, all_args_sorted: list) -> list:
     """Converts different semantics outputs into a single, ordered list of arguments."""
     if isinstance(result, dict):
-        return sorted(result, key=lambda arg: (-result.get(arg, -float('inf')), int(arg)))
+        # Highest score first, ties broken by argument number, in one lexsort
+        # (its last key is the primary one).
+        args = list(result)
+        scores = np.fromiter((result[arg] for arg in args), dtype=np.float64, count=len(args))
+        int_args = np.fromiter((int(arg) for arg in args), dtype=np.int64, count=len(args))
+        order = np.lexsort((int_args, -scores))
+        return [args[i] for i in order]
     if isinstance(result, list):
-        ranked_args = [arg for group in result for arg in sorted(list(group), key=int)]
+        ranked_args = [arg for group in result for arg in sorted(group, key=int)]
+        # Ranking groups are disjoint, so a full-length ranking has nothing missing.
+        if len(ranked_args) == len(all_args_sorted):
+            return ranked_args
         present_args_set = set(ranked_args)
         missing_args = [arg for arg in all_args_sorted if arg not in present_args_set]
         return ranked_args + sorted(missing_args, key=int)
@@ -82,30 +259,152 @@ def find_framework_files(root_dirs: list) -> list:
         if not os.path.exists(root_dir):
             print(f"Warning: Benchmark directory not found at '{root_dir}'")
             continue
-        for dirpath, _, filenames in os.walk(root_dir):
-            for filename in filenames:
-                if filename.endswith(".af"):
-                    framework_paths.append(os.path.join(dirpath, filename))
+        framework_paths.extend(iter_af_files(root_dir))
     return sorted(framework_paths)
 
 
 # --- HELPER FUNCTION ---
 
-def create_and_save_matrix(rankings: dict, result_path: str, metric_func, metric_name: str):
-    """Calculates and saves a correlation matrix for a given metric."""
-    semantics_names = sorted(list(rankings.keys()))
-    matrix = pd.DataFrame(index=semantics_names, columns=semantics_names, dtype=float)
-
-    for (name1, rank1), (name2, rank2) in itertools.combinations(rankings.items(), 2):
-        corr, _ = metric_func(rank1, rank2)
-        matrix.loc[name1, name2] = corr
-        matrix.loc[name2, name1] = corr
-    
-    for name in semantics_names:
-        matrix.loc[name, name] = 1.0
+def precompute_adjacency(arguments: list, attackers: np.ndarray, attacked: np.ndarray) -> dict:
+    """
+    Builds the transposed adjacency matrix (row i lists the attackers of
+    argument i) once per framework for all matrix-based semantics, directly
+    from the attacks given as positions in `arguments`.
+    """
+    num_args = len(arguments)
+    adj_T = csr_array(
+        (np.ones(len(attackers), dtype=np.int64), (attacked, attackers)), shape=(num_args, num_args)
+    )
+    adj_T.sort_indices()
+    return {
+        'adj_T_csr': adj_T,
+        'arguments': arguments,
+        'arg_to_index': {arg: i for i, arg in enumerate(arguments)}
+    }
+
+def get_parse_cache_path(framework_path: str) -> str:
+    """
+    Path of the parse cache of a framework: its path relative to data/ (or,
+    for files outside it, its absolute path) below PARSE_CACHE_DIR, plus '.npz'.
+    """
+    abs_path = os.path.abspath(framework_path)
+    rel_path = os.path.relpath(abs_path, os.path.dirname(os.path.abspath(PARSE_CACHE_DIR)))
+    if rel_path.startswith(os.pardir):
+        rel_path = os.path.splitdrive(abs_path)[1].lstrip(os.sep)
+    return os.path.join(PARSE_CACHE_DIR, rel_path + '.npz')
+
+def load_framework(framework_path: str) -> tuple:
+    """
+    Loads a framework as (af, all_args_sorted, precomputed). The parsed
+    arguments and attacks are cached under PARSE_CACHE_DIR, never next to the
+    .af file, and reused on later runs while the cache is newer than the .af file.
+    """
+    cache_path = get_parse_cache_path(framework_path)
+    args = None
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(framework_path):
+        try:
+            with np.load(cache_path) as data:
+                args = data['args'].tolist()
+                attacker_idx, attacked_idx = data['attackers'], data['attacked']
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable framework cache {cache_path}. Reason: {e}")
+            args = None
+
+    if args is None:
+        # The attacks are parsed straight into index arrays, so the DiGraph is
+        # only built once, below, from the same arrays as on a cache hit.
+        args, attacker_idx, attacked_idx = parse_af_edges(framework_path)
+        if args:
+            # Written under a temporary name first so that an interrupted run
+            # never leaves a truncated cache behind.
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, args=np.array(args), attackers=attacker_idx, attacked=attacked_idx)
+            os.replace(tmp_path, cache_path)
+
+    af = nx.DiGraph()
+    af.add_nodes_from(args)
+    af.add_edges_from(zip([args[i] for i in attacker_idx.tolist()], [args[i] for i in attacked_idx.tolist()]))
+
+    all_args_sorted = sorted(args, key=int)
+    # Position of every argument (in node order) within all_args_sorted.
+    sorted_position = np.empty(len(args), dtype=np.int64)
+    sorted_position[sorted(range(len(args)), key=lambda i: int(args[i]))] = np.arange(len(args))
+    precomputed = precompute_adjacency(all_args_sorted, sorted_position[attacker_idx], sorted_position[attacked_idx])
+    return af, all_args_sorted, precomputed
+
+def ranking_positions(ranking: list, arg_to_index: dict) -> np.ndarray:
+    """
+    Converts a normalized ranking into the position of every argument, indexed
+    like the sorted argument list. This compact array is what workers send back.
+    """
+    positions = np.empty(len(arg_to_index), dtype=np.int32)
+    positions[[arg_to_index[arg] for arg in ranking]] = np.arange(len(ranking), dtype=np.int32)
+    return positions
+
+def build_rank_matrix(rank_positions: dict, all_args_sorted: list) -> pd.DataFrame:
+    """
+    Builds one row per argument and one column per semantics holding the
+    position of that argument in the semantics' normalized ranking.
+    """
+    semantics_names = sorted(rank_positions.keys())
+    ranks = np.column_stack([rank_positions[name] for name in semantics_names]).astype(np.int64)
+    return pd.DataFrame(ranks, index=all_args_sorted, columns=semantics_names)
+
+def create_and_save_matrix(rank_matrix: pd.DataFrame, result_path: str, method: str, metric_name: str):
+    """Calculates and saves a correlation matrix for a given metric ('kendall' or 'spearman')."""
+    semantics_names = list(rank_matrix.columns)
+    if method == 'spearman':
+        # Normalized rankings are strict orders, so the positions already are
+        # tie-free ranks and Spearman's rho is their Pearson correlation.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.corrcoef(rank_matrix.to_numpy(), rowvar=False)
+    else:
+        corr = rank_matrix.corr(method=method).to_numpy(copy=True)
+    np.fill_diagonal(corr, 1.0)
 
     print(f"  Saving {metric_name} results to {result_path}")
-    matrix.to_csv(result_path)
+    # Written by hand in the same layout as DataFrame.to_csv (shortest
+    # round-trip floats, empty cells for NaN) without its formatting overhead.
+    with open(result_path, 'w') as f:
+        f.write(',' + ','.join(semantics_names) + '\n')
+        for name, row in zip(semantics_names, corr.tolist()):
+            f.write(name + ',' + ','.join('' if v != v else repr(v) for v in row) + '\n')
+
+
+def save_framework_results(framework_path: str, all_args_sorted: list, results: dict) -> str:
+    """
+    Writes the outcome of all semantics for one framework: a timeout marker if
+    any of them timed out, otherwise the rank positions of every finished
+    semantics ('<name>_ranks.npz', one int32 array per semantics next to the
+    sorted 'arguments') and the correlation matrices.
+    Returns 'timeout', 'processed' or 'skipped'.
+    """
+    framework_name = os.path.basename(framework_path)
+    base_result_name = framework_name.replace('.af', '')
+
+    timed_out = [name for name, (status, _, _) in results.items() if status == 'timeout']
+    if timed_out:
+        timeout_marker_path = os.path.join(RESULTS_DIR, f"{base_result_name}.timeout")
+        with open(timeout_marker_path, 'w') as f:
+            f.write(f"Timeout occurred on {time.ctime()} with semantics: {timed_out[0]}")
+        return 'timeout'
+
+    valid_positions = {name: payload for name, (status, payload, _) in results.items() if status == 'done'}
+    if valid_positions:
+        # The rankings themselves are kept as well, so later analyses can reuse
+        # them without recomputing the semantics.
+        np.savez_compressed(os.path.join(RESULTS_DIR, f"{base_result_name}_ranks.npz"),
+                            arguments=np.array(all_args_sorted), **valid_positions)
+    if len(valid_positions) < 2:
+        print("  Skipping correlation (not enough successful runs).")
+        return 'skipped'
+
+    rank_matrix = build_rank_matrix(valid_positions, all_args_sorted)
+    create_and_save_matrix(rank_matrix, os.path.join(RESULTS_DIR, f"{base_result_name}_kendall.csv"), 'kendall', "Kendall's Tau")
+    create_and_save_matrix(rank_matrix, os.path.join(RESULTS_DIR, f"{base_result_name}_spearman.csv"), 'spearman', "Spearman's Rho")
+    return 'processed'
 
 
 # --- Main Execution Logic ---
@@ -128,6 +427,8 @@ def main():
     timeout_count = 0
     already_done_count = 0
 
+    # Every framework is an independent task that runs all of its semantics.
+    tasks = []
     for i, framework_path in enumerate(framework_paths):
         framework_name = os.path.basename(framework_path)
         base_result_name = framework_name.replace('.af', '')
@@ -135,68 +436,45 @@ def main():
         spearman_path = os.path.join(RESULTS_DIR, f"{base_result_name}_spearman.csv")
         timeout_marker_path = os.path.join(RESULTS_DIR, f"{base_result_name}.timeout")
 
-        print(f"\n--- [{i+1}/{len(framework_paths)}] Checking: {framework_name} ---")
-
         if os.path.exists(timeout_marker_path):
-            print("  Previously timed out. Skipping.")
+            print(f"--- [{i+1}/{len(framework_paths)}] {framework_name}: Previously timed out. Skipping.")
             timeout_count += 1
             continue
         if os.path.exists(kendall_path) and os.path.exists(spearman_path):
-            print("  Result already exists. Skipping.")
+            print(f"--- [{i+1}/{len(framework_paths)}] {framework_name}: Result already exists. Skipping.")
             already_done_count += 1
             continue
         
         if "benchmarks_tweety" in framework_path:
-            semantics_to_run_now = {**FAST_SEMANTICS, **SLOW_SEMANTICS}
+            semantics_to_run_now = ALL_SEMANTICS
         else:
             semantics_to_run_now = FAST_SEMANTICS
         
-        try:
-            arg_framework = parse_af_file(framework_path)
-            all_args_sorted = sorted(list(arg_framework.nodes()), key=int)
-        except Exception as e:
-            print(f"  ERROR: Could not parse file. Skipping. Reason: {e}")
-            continue
+        tasks.append((framework_path, list(semantics_to_run_now)))
+
+    print(f"\nRunning semantics for {len(tasks)} frameworks...")
+
+    # Each framework runs in its own worker process, which the parent terminates
+    # when a semantics exceeds the timeout, so a hung kernel never blocks a slot.
+    if tasks:
+        num_workers = max(1, min(os.cpu_count() or 1, len(tasks)))
+        threads_per_worker = (os.cpu_count() or 1) // num_workers
+        for framework_path, all_args_sorted, results in run_frameworks(tasks, num_workers, threads_per_worker):
+            framework_name = os.path.basename(framework_path)
+            print(f"\n--- Finished: {framework_name} ---")
+            for name, (status, payload, elapsed) in results.items():
+                if status == 'done':
+                    print(f"  - {name} done ({elapsed:.2f}s)")
+                elif status == 'timeout':
+                    print(f"  - {name} TIMEOUT!")
+                else:
+                    print(f"  - {name} ERROR! ({payload})")
 
-        rankings = {}
-        framework_timed_out = False
-        for name, sem_class in semantics_to_run_now.items():
-            print(f"  - Running {name}...")
-            result_queue = mp.Queue()
-            process = mp.Process(target=semantics_worker, args=(name, sem_class, arg_framework, result_queue))
-            start_time = time.time()
-            process.start()
-            process.join(TIMEOUT_SECONDS)
-            end_time = time.time()
-
-            if process.is_alive():
-                process.terminate(); process.join()
-                print("    TIMEOUT!")
-                with open(timeout_marker_path, 'w') as f:
-                    f.write(f"Timeout occurred on {time.ctime()} with semantics: {name}")
-                framework_timed_out = True
+            outcome = save_framework_results(framework_path, all_args_sorted, results)
+            if outcome == 'processed':
+                processed_count += 1
+            elif outcome == 'timeout':
                 timeout_count += 1
-                break
-
-            result = result_queue.get()
-            if isinstance(result, Exception):
-                print(f"    ERROR! ({result})")
-                rankings[name] = None
-            else:
-                print(f"    done ({end_time - start_time:.2f}s)")
-                rankings[name] = normalize_ranking(result, all_args_sorted)
-        
-        if framework_timed_out:
-            continue
-
-        valid_rankings = {name: rank for name, rank in rankings.items() if rank is not None}
-        if len(valid_rankings) < 2:
-            print("  Skipping correlation (not enough successful runs).")
-            continue
-        
-        create_and_save_matrix(valid_rankings, kendall_path, kendalltau, "Kendall's Tau")
-        create_and_save_matrix(valid_rankings, spearman_path, spearmanr, "Spearman's Rho")
-        processed_count += 1
 
     # --- Part 2: Aggregate all results ---
     print("\n" + "=" * 60)
@@ -214,29 +492,26 @@ def main():
 
     def build_summary_matrix(files: list, all_sem_names: list) -> pd.DataFrame:
         if not files: return pd.DataFrame(index=all_sem_names, columns=all_sem_names)
-        agg_data = defaultdict(list)
-        for res_path in files:
-            df = pd.read_csv(res_path, index_col=0)
-            for (col1, col2) in itertools.combinations(df.columns, 2):
-                 if col1 in df.index and col2 in df.index:
-                    corr_val = df.loc[col1, col2]
-                    if pd.notna(corr_val):
-                        agg_data[(col1, col2)].append(corr_val)
-                        agg_data[(col2, col1)].append(corr_val)
-        summary_matrix = pd.DataFrame(index=all_sem_names, columns=all_sem_names, dtype=float)
-        for name1 in all_sem_names:
-            for name2 in all_sem_names:
-                if name1 == name2:
-                    summary_matrix.loc[name1, name2] = 1.0
-                else:
-                    corrs = agg_data.get((name1, name2), [])
-                    if corrs:
-                        summary_matrix.loc[name1, name2] = sum(corrs) / len(corrs)
-                    else:
-                        summary_matrix.loc[name1, name2] = None
-        return summary_matrix
-
-    all_semantics_names = sorted(list({**FAST_SEMANTICS, **SLOW_SEMANTICS}.keys()))
+        # Running sums and counts of the valid correlations of every pair,
+        # accumulated one whole matrix per result file.
+        num_sem = len(all_sem_names)
+        sum_arr = np.zeros((num_sem, num_sem))
+        count_arr = np.zeros((num_sem, num_sem), dtype=np.int64)
+        # pd.read_csv releases the GIL while parsing, so the many small result
+        # files are read concurrently and only the cheap combine step is serial.
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            dfs = executor.map(lambda res_path: pd.read_csv(res_path, index_col=0), files)
+            for df in dfs:
+                vals = df.reindex(index=all_sem_names, columns=all_sem_names).to_numpy(dtype=float)
+                valid = ~np.isnan(vals)
+                sum_arr += np.where(valid, vals, 0.0)
+                count_arr += valid
+        with np.errstate(divide='ignore', invalid='ignore'):
+            summary = sum_arr / count_arr
+        np.fill_diagonal(summary, 1.0)
+        return pd.DataFrame(summary, index=all_sem_names, columns=all_sem_names)
+
+    all_semantics_names = sorted(ALL_SEMANTICS.keys())
     pd.set_option('display.float_format', '{:.4f}'.format)
 
     print("\nAverage Kendall's Tau Correlation Matrix (All Valid Frameworks):\n")
@@ -251,10 +526,4 @@ def main():
 
 
 if __name__ == '__main__':
-    try:
-        if mp.get_start_method() != "fork":
-            mp.set_start_method("fork", force=True)
-    except (RuntimeError, AttributeError):
-        print("Warning: Could not set multiprocessing start method to 'fork'. Using default.")
-    
-    main()
\ No newline at end of file
+    main()
@@ -5,11 +5,17 @@ import numpy as np
 import scipy.sparse
 import time
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 class Cat:
     """
     Implements the Categoriser-based ranking semantics (Cat).
     """
-    def __init__(self, af: nx.DiGraph, tolerance: float = 1e-8, max_iterations: int = 1000):
+    def __init__(self, af: nx.DiGraph, tolerance: float = 1e-8, max_iterations: int = 1000,
+                 precomputed: dict | None = None):
         """
         Initializes the Categoriser semantics calculator.
 
@@ -20,18 +26,28 @@ class Cat:
                        strength is less than this value.
             max_iterations: The maximum number of iterations to perform before
                             stopping, even if convergence is not reached.
+            precomputed: Optional dict with the keys 'adj_T_csr', 'arguments' and
+                         'arg_to_index', built once per framework so that several
+                         semantics can share the transposed adjacency matrix.
         """
         if not isinstance(af, nx.DiGraph):
             raise TypeError("Argumentation framework must be a NetworkX DiGraph.")
 
         self.af = af
-        self.arguments = sorted(list(af.nodes))
-        self.arg_to_index = {arg: i for i, arg in enumerate(self.arguments)}
+        if precomputed is not None:
+            self.arguments = precomputed['arguments']
+            self.arg_to_index = precomputed['arg_to_index']
+            self._adj_T = precomputed['adj_T_csr']
+        else:
+            self.arguments = sorted(list(af.nodes))
+            self.arg_to_index = {arg: i for i, arg in enumerate(self.arguments)}
+            self._adj_T = None
         self.num_args = len(self.arguments)
         self.tolerance = tolerance
         self.max_iterations = max_iterations
         
-        self._strengths = {}
+        self._strengths_vector = np.zeros(0)
+        self._strengths = None
         self._ranking = []
 
         self._calculate_strengths()
@@ -58,31 +74,45 @@ class Cat:
         # adj_T[i, j] = 1 means argument `j` attacks argument `i`.
         # This allows us to compute the sum of attacker strengths for all
         # arguments at once using a single matrix-vector product.
-        adj_T = nx.to_scipy_sparse_array(
-            self.af, nodelist=self.arguments
-        ).transpose().tocsr()
-
-        # Initialize strengths vector S with zeros.
-        strengths_vector = np.zeros(self.num_args)
-
-        # print(f"Iteratively solving for {self.num_args} arguments...")
-        for i in range(self.max_iterations):
-            old_strengths = strengths_vector
-
-            # Calculate the sum of strengths of all attackers for each argument.
-            attacker_strengths_sum = adj_T @ old_strengths
-
-            # Update the strength of every argument in a single vectorized operation.
-            strengths_vector = 1 / (1 + attacker_strengths_sum)
-            
-            # Check for convergence using the infinity norm (maximum absolute difference).
-            if np.linalg.norm(strengths_vector - old_strengths, ord=np.inf) < self.tolerance:
-                # print(f"Converged after {i + 1} iterations.")
-                break
-        else: # This else clause executes if the for loop completes without a 'break'.
-            print(f"Warning: Did not converge within {self.max_iterations} iterations.")
-
-        self._strengths = {arg: strengths_vector[self.arg_to_index[arg]] for arg in self.arguments}
+        adj_T = self._adj_T
+        if adj_T is None:
+            adj_T = nx.to_scipy_sparse_array(
+                self.af, nodelist=self.arguments, format='csc'
+            ).transpose()
+
+        if _iterate_strengths is not None:
+            # Compiled path: the SpMV, the update and the convergence check are
+            # fused into one parallel pass over the arguments per iteration.
+            strengths_vector, converged = _iterate_strengths(
+                adj_T.indptr, adj_T.indices, adj_T.data.astype(np.float64),
+                self.tolerance, self.max_iterations
+            )
+            if not converged:
+                print(f"Warning: Did not converge within {self.max_iterations} iterations.")
+        else:
+            # Initialize strengths vector S with zeros.
+            strengths_vector = np.zeros(self.num_args)
+
+            # print(f"Iteratively solving for {self.num_args} arguments...")
+            for i in range(self.max_iterations):
+                old_strengths = strengths_vector
+
+                # Calculate the sum of strengths of all attackers for each argument.
+                attacker_strengths_sum = adj_T @ old_strengths
+
+                # Update the strength of every argument in a single vectorized operation.
+                strengths_vector = 1 / (1 + attacker_strengths_sum)
+                
+                # Check for convergence using the infinity norm (maximum absolute difference).
+                if np.linalg.norm(strengths_vector - old_strengths, ord=np.inf) < self.tolerance:
+                    # print(f"Converged after {i + 1} iterations.")
+                    break
+            else: # This else clause executes if the for loop completes without a 'break'.
+                print(f"Warning: Did not converge within {self.max_iterations} iterations.")
+
+        # The vector is indexed like self.arguments; the per-argument dict is
+        # only built if get_strengths() is called.
+        self._strengths_vector = strengths_vector
         # print(f"Strength calculation finished in {time.time() - start_time:.2f} seconds.")
 
     def _build_ranking(self):
@@ -90,32 +120,52 @@ class Cat:
         Sorts arguments into a ranking based on their calculated strengths.
         Arguments with nearly identical strengths are grouped together.
         """
-        if not self._strengths:
+        if self.num_args == 0:
             return
 
         # Sort arguments by strength in descending order (higher strength is better).
-        sorted_args = sorted(self.arguments, key=lambda arg: self._strengths[arg], reverse=True)
-        
-        self._ranking = []
-        current_rank_group = {sorted_args[0]}
-
-        for i in range(1, len(sorted_args)):
-            prev_arg = sorted_args[i-1]
-            curr_arg = sorted_args[i]
-            
-            # Group arguments if their strengths are within the tolerance margin.
-            if abs(self._strengths[curr_arg] - self._strengths[prev_arg]) < self.tolerance:
-                current_rank_group.add(curr_arg)
-            else:
-                self._ranking.append(current_rank_group)
-                current_rank_group = {curr_arg}
-        
-        self._ranking.append(current_rank_group)
+        # The stable sort keeps equal strengths in argument order.
+        order = np.argsort(-self._strengths_vector, kind='stable')
+        sorted_strengths = self._strengths_vector[order]
+
+        # A new group starts wherever neighbouring strengths differ by at least
+        # the tolerance margin; closer ones are grouped together.
+        boundaries = np.flatnonzero(np.abs(np.diff(sorted_strengths)) >= self.tolerance) + 1
+        self._ranking = [{self.arguments[i] for i in group} for group in np.split(order, boundaries)]
 
     def get_strengths(self) -> dict[str, float]:
         """Returns the calculated strength for each argument."""
+        if self._strengths is None:
+            self._strengths = dict(zip(self.arguments, self._strengths_vector))
         return self._strengths
 
     def get_ranking(self) -> list[set[str]]:
         """Returns the final ranking of arguments from most to least acceptable."""
-        return self._ranking
\ No newline at end of file
+        return self._ranking
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _iterate_strengths(indptr, indices, data, tolerance, max_iterations):
+        """
+        Runs the Categoriser fixed-point iteration on A^T in CSR form, starting
+        from all-zero strengths. Returns the strengths and whether they converged.
+        """
+        num_args = len(indptr) - 1
+        strengths = np.zeros(num_args)
+        new_strengths = np.empty(num_args)
+        for _ in range(max_iterations):
+            max_change = 0.0
+            for i in prange(num_args):
+                attacker_strengths_sum = 0.0
+                for k in range(indptr[i], indptr[i + 1]):
+                    attacker_strengths_sum += data[k] * strengths[indices[k]]
+                value = 1.0 / (1.0 + attacker_strengths_sum)
+                new_strengths[i] = value
+                max_change = max(max_change, abs(value - strengths[i]))
+            strengths, new_strengths = new_strengths, strengths
+            if max_change < tolerance:
+                return strengths, True
+        return strengths, False
+else:
+    _iterate_strengths = None
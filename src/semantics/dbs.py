@@ -1,74 +1,287 @@
 # semantics/dbs.py
 
+import warnings
+
 import networkx as nx
 import numpy as np
 from scipy.sparse import csr_array
 from typing import List, Dict, Set
 
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:
+    njit = None
+
+# Above this many attacks scipy's own SpMV outperforms the serial compiled kernel,
+# whose advantage is only the saved per-call overhead on small frameworks. Larger
+# frameworks use the parallel kernel instead when numba may run several threads.
+COMPILED_SPMV_MAX_ATTACKS = 4000
+
+# Path counts are kept in int64 while the next product cannot exceed this limit,
+# and continue in float64 beyond it.
+PATH_COUNT_LIMIT = np.iinfo(np.int64).max
+
 class Dbs:
-    def __init__(self, af: nx.DiGraph, max_path_length: int = 0):
+    def __init__(self, af: nx.DiGraph, max_path_length: int = 0, precomputed: dict | None = None,
+                 early_exit: bool = True):
         if not isinstance(af, nx.DiGraph):
             raise TypeError("Argumentation framework must be a NetworkX DiGraph.")
 
         self.af = af
-        self.arguments = sorted(list(af.nodes))
+        # A precomputed dict ('adj_T_csr', 'arguments', 'arg_to_index') lets
+        # several semantics share one transposed adjacency matrix per framework.
+        self._precomputed = precomputed
+        self.arguments = precomputed['arguments'] if precomputed is not None else sorted(list(af.nodes))
         self.num_args = len(self.arguments)
         
         # If max_path_length is not specified (or 0), default to num_args
         self.max_path_length = max_path_length if max_path_length > 0 else self.num_args
+        # Stop computing path counts once they can no longer change the ranking.
+        # The result is identical either way while the counts fit into int64;
+        # disabling it only costs time. Beyond int64 the counts are approximated in
+        # float64, whose rounding may split ties that the early exit keeps.
+        self.early_exit = early_exit
         
-        self._discussion_vectors: Dict[str, List[int]] = {}
+        self._discussion_vectors: Dict[str, List[int]] | None = None
         self._ranking: List[Set[str]] = []
         self._calculate_ranking()
 
     def _calculate_ranking(self):
         if self.num_args == 0:
+            self._discussion_vectors = {}
             return
 
-        adj_matrix_T = nx.to_scipy_sparse_array(
-            self.af, nodelist=self.arguments, dtype=np.int64
-        ).transpose().tocsr()
+        # Building the matrix in CSC and transposing it yields A^T directly in
+        # CSR (row i lists the attackers of argument i) without a format conversion.
+        if self._precomputed is not None:
+            self._adj_matrix_T = self._precomputed['adj_T_csr']
+        else:
+            self._adj_matrix_T = nx.to_scipy_sparse_array(
+                self.af, nodelist=self.arguments, dtype=np.int64, format='csc'
+            ).transpose()
+
+        if self._adj_matrix_T.nnz == 0:
+            # Without attacks every discussion vector is all zero, so all arguments
+            # are tied and the (num_args, max_path_length) array is never needed.
+            self._ranking = [set(self.arguments)]
+            return
         
-        self._discussion_vectors = {arg: [] for arg in self.arguments}
+        # One row per argument and one column per path length; columns past an
+        # early exit simply stay zero.
+        self._vectors = np.zeros((self.num_args, self.max_path_length), dtype=np.int64)
         
-        current_power = adj_matrix_T.copy()
+        self._compiled_spmv = None
+        if _count_longer_paths is not None:
+            if self._adj_matrix_T.nnz < COMPILED_SPMV_MAX_ATTACKS:
+                self._compiled_spmv = _count_longer_paths
+            elif get_num_threads() > 1:
+                self._compiled_spmv = _count_longer_paths_parallel
         
-        for path_length in range(1, self.max_path_length + 1):
-            num_paths_per_arg = np.array(current_power.sum(axis=1)).flatten()
-            
-            sign = 1 if path_length % 2 != 0 else -1
+        # Paths of length 1 are just the in-degrees, read off the CSR row pointers.
+        self._num_paths_per_arg = np.diff(self._adj_matrix_T.indptr).astype(np.int64)
+        self._next_path_length = 1
+        # Attacker paths (odd lengths) count positively, defender paths negatively.
+        self._signs = np.where(np.arange(1, self.max_path_length + 1) % 2 == 1, 1, -1)
+        
+        # Path counts grow exponentially on cyclic frameworks. One product can
+        # multiply the largest count by at most the maximum in-degree, so above
+        # this bound the next product could exceed PATH_COUNT_LIMIT.
+        self._overflow_bound = PATH_COUNT_LIMIT // max(int(self._num_paths_per_arg.max()), 1)
+
+        if self.early_exit:
+            ranks = self._extend_vectors(stop_when_stable=True)
+        else:
+            self._extend_vectors()
+            # Dense ranks of the complete vectors in lexicographic order.
+            ranks = np.unique(self._vectors, axis=0, return_inverse=True)[1].reshape(-1)
+
+        # The ranks are dense positions in the lexicographic order of the
+        # vectors, so each distinct rank is one group, from best to worst.
+        order = np.argsort(ranks, kind='stable')
+        boundaries = np.flatnonzero(np.diff(ranks[order])) + 1
+        self._ranking = [{self.arguments[i] for i in group} for group in np.split(order, boundaries)]
+
+    def _extend_vectors(self, stop_when_stable: bool = False) -> np.ndarray | None:
+        """
+        Fills the discussion vector columns from the next pending path length on.
+        With stop_when_stable, it refines the dense lexicographic rank of every
+        argument's vector prefix after each column, returns those ranks, and
+        stops as soon as the classes of equal prefixes are equitable (see
+        _is_equitable): every later column is then constant on each class, so
+        the ranking is final, and the remaining columns are only computed if
+        the vectors themselves are requested.
+        """
+        ranks = np.zeros(self.num_args, dtype=np.int64)
+        num_paths_per_arg = self._num_paths_per_arg
+        
+        if not stop_when_stable and _fill_vectors is not None and self._compiled_spmv is _count_longer_paths \
+                and self._vectors.dtype == np.int64:
+            # With no ranks to refine in between, the remaining columns are filled
+            # in one compiled call. It hands back early only when the counts need
+            # float64, which the loop below then takes over.
+            self._next_path_length, num_paths_per_arg = _fill_vectors(
+                self._adj_matrix_T.indptr, self._adj_matrix_T.indices, self._adj_matrix_T.data,
+                num_paths_per_arg, self._vectors, self._signs, self._next_path_length, self._overflow_bound
+            )
+        
+        while self._next_path_length <= self.max_path_length:
+            path_length = self._next_path_length
+            if path_length > 1:
+                if not num_paths_per_arg.any():
+                    # Every longer path count is zero as well, and so are the
+                    # remaining columns.
+                    self._next_path_length = self.max_path_length + 1
+                    break
+                if self._vectors.dtype == np.int64 and num_paths_per_arg.max() > self._overflow_bound:
+                    # Continue in float64: counts beyond int64 are approximated
+                    # instead of silently wrapping around and corrupting the ranking.
+                    self._vectors = self._vectors.astype(np.float64)
+                    num_paths_per_arg = num_paths_per_arg.astype(np.float64)
+                # Only the row sums of each matrix power are needed, and the row
+                # sums of (A^T)^k are exactly (A^T)^k · 1. Iterating on that vector
+                # replaces a sparse matrix-matrix product per path length with an SpMV.
+                if self._compiled_spmv is not None and num_paths_per_arg.dtype == np.int64:
+                    num_paths_per_arg = self._compiled_spmv(
+                        self._adj_matrix_T.indptr, self._adj_matrix_T.indices,
+                        self._adj_matrix_T.data, num_paths_per_arg
+                    )
+                else:
+                    num_paths_per_arg = self._adj_matrix_T @ num_paths_per_arg
+                if num_paths_per_arg.dtype == np.float64 and not np.isfinite(num_paths_per_arg).all():
+                    # Even float64 counts saturate at inf for long paths at high
+                    # in-degree, and saturated counts would all compare equal. The
+                    # ranking is left to the shorter path lengths, whose counts are
+                    # finite, and the remaining columns stay zero.
+                    warnings.warn(f"Path counts of length {path_length} exceed the float64 range; "
+                                  f"only paths up to length {path_length - 1} are compared.",
+                                  RuntimeWarning)
+                    self._next_path_length = self.max_path_length + 1
+                    break
             
-            for i, arg in enumerate(self.arguments):
-                self._discussion_vectors[arg].append(sign * int(num_paths_per_arg[i]))
+            # Written straight into the vectors array with its sign applied, so
+            # no temporary column is allocated.
+            column = self._vectors[:, path_length - 1]
+            np.multiply(num_paths_per_arg, self._signs[path_length - 1], out=column)
+            self._next_path_length += 1
             
-            if path_length < self.max_path_length:
-                if current_power.nnz == 0:
-                    # Pad the rest of the vectors with zeros
-                    for arg in self.arguments:
-                        self._discussion_vectors[arg].extend([0] * (self.max_path_length - path_length))
+            if stop_when_stable:
+                previous_num_classes = ranks.max() + 1
+                ranks = _refine_ranks(ranks, column)
+                num_classes = ranks.max() + 1
+                # An equitable partition is never split by the next column, so
+                # the check is only needed when this column split nothing.
+                if num_classes == self.num_args or (
+                    num_classes == previous_num_classes and _is_equitable(self._adj_matrix_T, ranks)
+                ):
                     break
-                current_power = current_power.dot(adj_matrix_T)
-
-        sorted_args = sorted(self.arguments, key=lambda arg: self._discussion_vectors[arg])
         
-        if not sorted_args:
-            return
-
-        self._ranking = []
-        current_rank_group = {sorted_args[0]}
-        for i in range(1, len(sorted_args)):
-            prev_arg = sorted_args[i-1]
-            curr_arg = sorted_args[i]
-            
-            if self._discussion_vectors[curr_arg] == self._discussion_vectors[prev_arg]:
-                current_rank_group.add(curr_arg)
-            else:
-                self._ranking.append(current_rank_group)
-                current_rank_group = {curr_arg}
-        self._ranking.append(current_rank_group)
+        self._num_paths_per_arg = num_paths_per_arg
+        return ranks if stop_when_stable else None
 
     def get_discussion_vectors(self) -> Dict[str, List[int]]:
+        if self._discussion_vectors is None and self._adj_matrix_T.nnz == 0:
+            self._discussion_vectors = {arg: [0] * self.max_path_length for arg in self.arguments}
+        elif self._discussion_vectors is None:
+            self._extend_vectors()
+            self._discussion_vectors = {arg: self._vectors[i].tolist() for i, arg in enumerate(self.arguments)}
         return self._discussion_vectors
 
     def get_ranking(self) -> List[Set[str]]:
-        return self._ranking
\ No newline at end of file
+        return self._ranking
+
+def _refine_ranks(ranks: np.ndarray, column: np.ndarray) -> np.ndarray:
+    """
+    Given dense ranks of the vector prefixes, returns the dense ranks of the
+    prefixes extended by one more column, in lexicographic order.
+    """
+    order = np.lexsort((column, ranks))
+    sorted_ranks, sorted_column = ranks[order], column[order]
+    starts_new_group = np.empty(len(order), dtype=bool)
+    starts_new_group[0] = False
+    starts_new_group[1:] = (sorted_ranks[1:] != sorted_ranks[:-1]) | (sorted_column[1:] != sorted_column[:-1])
+    refined = np.empty(len(order), dtype=np.int64)
+    refined[order] = np.cumsum(starts_new_group)
+    return refined
+
+
+def _is_equitable(adj_matrix_T, ranks: np.ndarray) -> bool:
+    """
+    Checks whether all arguments of a class have the same number of attackers
+    in each class. The next path counts are sums over attackers, so if the
+    current counts are constant on such classes, all later ones are too.
+    """
+    if adj_matrix_T.nnz == 0:
+        return True
+    num_classes = int(ranks.max()) + 1
+    attacked = np.repeat(np.arange(len(ranks)), np.diff(adj_matrix_T.indptr))
+    # Number of attackers of each argument within each class, keyed by
+    # (argument, attacker class).
+    keys, inverse = np.unique(attacked * num_classes + ranks[adj_matrix_T.indices], return_inverse=True)
+    counts = np.bincount(inverse, weights=adj_matrix_T.data)
+    arg_classes = ranks[keys // num_classes]
+    # Within every (class, attacker class) pair, each member of the class must
+    # appear once and all of them with the same count.
+    pair_keys = arg_classes * num_classes + keys % num_classes
+    order = np.argsort(pair_keys, kind='stable')
+    pair_keys, counts = pair_keys[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, pair_keys[1:] != pair_keys[:-1]])
+    group_sizes = np.diff(np.r_[starts, len(pair_keys)])
+    class_sizes = np.bincount(ranks, minlength=num_classes)
+    if np.any(group_sizes != class_sizes[pair_keys[starts] // num_classes]):
+        return False
+    return bool(np.all(np.minimum.reduceat(counts, starts) == np.maximum.reduceat(counts, starts)))
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_longer_paths(indptr, indices, data, num_paths_per_arg):
+        """
+        Compiled SpMV for A^T in CSR form: sums the path counts of each
+        argument's attackers, without scipy's per-call dispatch and upcasting.
+        """
+        result = np.zeros_like(num_paths_per_arg)
+        for row in range(len(indptr) - 1):
+            total = 0
+            for k in range(indptr[row], indptr[row + 1]):
+                total += data[k] * num_paths_per_arg[indices[k]]
+            result[row] = total
+        return result
+
+    @njit(parallel=True, cache=True)
+    def _count_longer_paths_parallel(indptr, indices, data, num_paths_per_arg):
+        """Variant of _count_longer_paths that splits the rows across threads."""
+        result = np.zeros_like(num_paths_per_arg)
+        for row in prange(len(indptr) - 1):
+            total = 0
+            for k in range(indptr[row], indptr[row + 1]):
+                total += data[k] * num_paths_per_arg[indices[k]]
+            result[row] = total
+        return result
+
+    @njit(cache=True)
+    def _fill_vectors(indptr, indices, data, num_paths_per_arg, vectors, signs, path_length, overflow_bound):
+        """
+        Writes the signed path counts of every length from path_length (1-based)
+        on into the columns of vectors. For path_length 1, num_paths_per_arg holds
+        the counts of length 1, which are written as they are; otherwise it holds
+        the counts of length path_length - 1, which are extended by one step
+        before each column is written. Returns the first length not written and
+        the counts of the length before it: past the last column once the counts
+        vanish or all columns are written, or the length whose counts could
+        overflow int64.
+        """
+        max_path_length = vectors.shape[1]
+        while path_length <= max_path_length:
+            if path_length > 1:
+                if not num_paths_per_arg.any():
+                    return max_path_length + 1, num_paths_per_arg
+                if num_paths_per_arg.max() > overflow_bound:
+                    return path_length, num_paths_per_arg
+                num_paths_per_arg = _count_longer_paths(indptr, indices, data, num_paths_per_arg)
+            for row in range(len(num_paths_per_arg)):
+                vectors[row, path_length - 1] = signs[path_length - 1] * num_paths_per_arg[row]
+            path_length += 1
+        return path_length, num_paths_per_arg
+else:
+    _count_longer_paths = None
+    _count_longer_paths_parallel = None
+    _fill_vectors = None
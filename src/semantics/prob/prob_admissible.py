@@ -1,6 +1,7 @@
 # semantics/prob_admissible.py
 
 import networkx as nx
+import numpy as np
 from collections import defaultdict
 
 class ProbAdmissible:
@@ -25,36 +26,32 @@ class ProbAdmissible:
         """
         Computes the score for each argument 'a' as Pr({a} is admissible).
         """
-        self._scores = {}
         all_args = list(self.af.nodes)
-
-        for i, arg_a in enumerate(all_args):
-            # print(f"\rCalculating analytical score for argument {i+1}/{len(all_args)}...", end="")
-
-            # 1. Probability that 'a' itself exists.
-            prob_a_exists = self.p
-
-            # 2. Probability that 'a' is conflict-free (i.e., no self-attack).
-            # If a self-attack (a,a) exists, it must not be chosen. In the problem model,
-            # attacks only exist if both nodes exist, so Pr(self_attack) = p.
-            # We assume attacks in the base graph are certain if nodes exist.
-            prob_a_is_cf = 1.0 if not self.af.has_edge(arg_a, arg_a) else 0.0
-
-            # 3. Probability that 'a' is defended against all attackers.
-            # This is a product over all potential attackers 'b'.
-            prob_a_is_defended = 1.0
-            attackers_of_a = list(self.af.predecessors(arg_a))
-
-            for arg_b in attackers_of_a:
-                if arg_b == arg_a: continue # Handled by conflict-free check
-                
-                prob_b_is_counter_attacked = (1 - self.p)
-                if self.af.has_edge(arg_a, arg_b):
-                    prob_b_is_counter_attacked += self.p
-
-                prob_a_is_defended *= prob_b_is_counter_attacked
-
-            # Final score for 'a' is the product of these probabilities.
-            self._scores[arg_a] = prob_a_exists * prob_a_is_cf * prob_a_is_defended
-        
-        # print("\rAnalytical calculation complete.                      ")
\ No newline at end of file
+        if not all_args:
+            self._scores = {}
+            return
+
+        # adj[a, b] != 0 iff a attacks b, so row a of adj_T lists the attackers of a.
+        adj = nx.to_scipy_sparse_array(self.af, nodelist=all_args, weight=None, format='csr')
+        adj_T = adj.transpose().tocsr()
+
+        # 1. Probability that 'a' itself exists.
+        prob_a_exists = self.p
+
+        # 2. Probability that 'a' is conflict-free (i.e., no self-attack).
+        # We assume attacks in the base graph are certain if nodes exist.
+        has_self_attack = adj.diagonal() != 0
+        prob_a_is_cf = np.where(has_self_attack, 0.0, 1.0)
+
+        # 3. Probability that 'a' is defended against all attackers.
+        # An attacker 'b' that 'a' attacks back is always countered (if 'b'
+        # exists, so does the counter-attack); any other attacker must be
+        # absent, with probability (1 - p). A self-attack is both an attacker
+        # and its own counter-attack, so it cancels out of the difference below.
+        num_attackers = np.diff(adj_T.indptr)
+        num_counter_attacked = np.diff(adj_T.multiply(adj).tocsr().indptr)
+        prob_a_is_defended = (1 - self.p) ** (num_attackers - num_counter_attacked)
+
+        # Final score for 'a' is the product of these probabilities.
+        scores = prob_a_exists * prob_a_is_cf * prob_a_is_defended
+        self._scores = dict(zip(all_args, scores.tolist()))
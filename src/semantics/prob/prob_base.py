@@ -1,103 +1,235 @@
 import abc
-import random
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, FrozenSet, List, Set
 import networkx as nx
+import numpy as np
+
+from util.parallel import resolve_n_jobs
 
 try:
     import pysat.solvers
 except ImportError:
     pysat = None
 
+# Upper bound on the number of random draws (samples x arguments) held in memory at once.
+SAMPLE_BLOCK_SIZE = 1 << 22
+
 class ProbabilisticSemantics(abc.ABC):
-    def __init__(self, af: nx.DiGraph, num_samples: int = 10000, p: float = 0.5):
+    def __init__(self, af: nx.DiGraph, num_samples: int = 10000, p: float = 0.5, n_jobs: int = 1):
         self.af = af
         self.num_samples = num_samples
         self.p = p
+        # Number of processes sharing the Monte Carlo samples (-1 uses every core).
+        self.n_jobs = n_jobs
         self.all_nodes: List[Any] = list(self.af.nodes)
         self._scores: Dict[Any, float] | None = None
 
+        # Sets of arguments are Python-int bitsets over the positions in all_nodes.
+        # Bit j of _attackers[i] is set iff j attacks i; bit j of _attacks[i] iff i attacks j.
+        self._node_index: Dict[Any, int] = {node: i for i, node in enumerate(self.all_nodes)}
+        self._attackers: List[int] = [0] * len(self.all_nodes)
+        self._attacks: List[int] = [0] * len(self.all_nodes)
+        for u, v in self.af.edges:
+            i, j = self._node_index[u], self._node_index[v]
+            self._attacks[i] |= 1 << j
+            self._attackers[j] |= 1 << i
+        # Arguments without any attacks are accepted in every extension and do not
+        # affect the others, so they are stripped before looking up _accepted_cache.
+        self._isolated: int = 0
+        for i in range(len(self.all_nodes)):
+            if not self._attackers[i] and not self._attacks[i]:
+                self._isolated |= 1 << i
+        self._accepted_cache: Dict[int, int] = {}
+
+    def __getstate__(self):
+        # Monte Carlo workers receive the instance for _find_extensions_in_mask and the
+        # state it reads, but neither need the DiGraph nor the subgraphs memoized here.
+        state = self.__dict__.copy()
+        state['af'] = None
+        state['_accepted_cache'] = {}
+        return state
+
     @abc.abstractmethod
-    def _find_extensions_in_subgraph(self, subgraph: nx.DiGraph) -> List[FrozenSet[Any]]:
+    def _find_extensions_in_mask(self, active: int) -> List[int]:
+        """Returns the extensions (as bitsets) of the subgraph induced by the active bitset."""
         raise NotImplementedError
 
+    def _find_extensions_in_subgraph(self, subgraph: nx.DiGraph) -> List[FrozenSet[Any]]:
+        """
+        Label-based wrapper around _find_extensions_in_mask. The subgraph must be
+        induced by self.af, so only its node set is used.
+        """
+        extensions = self._find_extensions_in_mask(self._mask_of(subgraph.nodes))
+        return [self._nodes_of(ext) for ext in extensions]
+
+    @staticmethod
+    def _iter_bits(mask: int):
+        """Yields the positions of the set bits of mask in increasing order."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _mask_of(self, nodes) -> int:
+        mask = 0
+        for node in nodes:
+            mask |= 1 << self._node_index[node]
+        return mask
+
+    def _nodes_of(self, mask: int) -> FrozenSet[Any]:
+        return frozenset(self.all_nodes[i] for i in self._iter_bits(mask))
+
+    def _attacked_by(self, mask: int) -> int:
+        """Bitset of all arguments attacked by some argument in mask."""
+        attacked = 0
+        for i in self._iter_bits(mask):
+            attacked |= self._attacks[i]
+        return attacked
+
     def get_scores(self) -> Dict[str, float]:
         if self._scores is None:
             self._calculate_scores()
         return self._scores
 
-    def _get_all_subgraphs(self):
-        """Generator that yields all 2^n possible non-empty subgraphs."""
-        nodes = self.all_nodes
-        num_nodes = len(nodes)
-        # Iterate from 1 to 2^n - 1 to skip the empty set, which has no accepted arguments.
-        for i in range(1, 1 << num_nodes):
-            subgraph_nodes = [nodes[j] for j in range(num_nodes) if (i >> j) & 1]
-            yield self.af.subgraph(subgraph_nodes)
-
     def _calculate_scores(self) -> None:
         """
         Smart function for calculating probabilistic scores.
-        - If the total number of possible subgraphs is less than the number of
-          samples, it performs an exact calculation.
+        - If either the total number of possible subgraphs or the number of
+          subsets of all ancestor closures together is less than the number of
+          samples, it performs an exact calculation, enumerating whichever of
+          the two is smaller.
         - Otherwise, it falls back to a Monte Carlo simulation.
         """
         num_nodes = len(self.all_nodes)
         
         # --- Dynamic Decision Logic ---
+        # Exact enumeration is chosen when its cheaper variant, over all subgraphs
+        # or over the ancestor closures, needs fewer subgraphs than sampling.
         # Calculate the total number of possible subgraphs (2^n).
         # The (1 << num_nodes) is a fast way to compute 2**num_nodes.
         total_combinations = 1 << num_nodes
-        
+
+        # All concrete semantics satisfy directionality: whether an argument is
+        # credulously accepted only depends on the subgraph induced by its ancestors.
+        # Enumerating the subsets of each component's ancestor closure instead of
+        # all 2^n subgraphs is exact as well, and often far cheaper.
+        ancestor_groups = self._ancestor_groups()
+        grouped_combinations = sum(1 << closure.bit_count() for _, closure in ancestor_groups)
+
         # --- Exact Calculation Path ---
-        if total_combinations < self.num_samples:
-            self._scores = {node: 0.0 for node in self.all_nodes}
-            
-            for subgraph in self._get_all_subgraphs():
-                num_in = subgraph.number_of_nodes()
-                num_out = num_nodes - num_in
-                subgraph_prob = (self.p ** num_in) * ((1 - self.p) ** num_out)
-
-                extensions = self._find_extensions_in_subgraph(subgraph)
-                credulously_accepted = frozenset.union(*extensions) if extensions else frozenset()
-
-                for arg in credulously_accepted:
-                    self._scores[arg] += subgraph_prob
+        if min(total_combinations, grouped_combinations) < self.num_samples:
+            full_mask = total_combinations - 1
+            if grouped_combinations >= total_combinations:
+                ancestor_groups = [(full_mask, full_mask)]
+            scores = np.zeros(num_nodes)
+            for group, closure in ancestor_groups:
+                self._add_closure_scores(scores, group, closure)
+            self._scores = dict(zip(self.all_nodes, scores.tolist()))
             return
 
         # --- Monte Carlo Simulation Path ---
-        acceptance_counts = defaultdict(int)
-        for _ in range(self.num_samples):
-            subgraph_nodes = [node for node in self.all_nodes if random.random() < self.p]
-            if not subgraph_nodes:
-                continue
-            subgraph = self.af.subgraph(subgraph_nodes)
-            extensions = self._find_extensions_in_subgraph(subgraph)
-            credulously_accepted = frozenset.union(*extensions) if extensions else frozenset()
-            for arg in credulously_accepted:
-                acceptance_counts[arg] += 1
-        self._scores = {node: acceptance_counts.get(node, 0) / self.num_samples for node in self.all_nodes}
-
-    # Helper for SAT-based semantics
-    def _get_complete_encoding(self, subgraph: nx.DiGraph):
-        nodes = list(subgraph.nodes)
-        arg_map = {i + 1: arg for i, arg in enumerate(nodes)}
-        var_map = {arg: i + 1 for i, arg in enumerate(nodes)}
-        N = len(nodes)
-        clauses = []
-        for a in nodes:
-            in_a, out_a, undec_a = var_map[a], var_map[a] + N, var_map[a] + 2 * N
-            clauses.extend([[in_a, out_a, undec_a], [-in_a, -out_a], [-in_a, -undec_a], [-out_a, -undec_a]])
-            attackers_in = [var_map[b] for b in subgraph.predecessors(a)]
-            if attackers_in:
-                clauses.append([-out_a] + attackers_in)
-                for att_var in attackers_in: clauses.append([out_a, -att_var])
-            else:
-                clauses.append([-out_a])
-            attackers_out = [var_map[b] + N for b in subgraph.predecessors(a)]
-            if attackers_out:
-                clauses.append([in_a] + [-v for v in attackers_out])
-                for v in attackers_out: clauses.append([-in_a, v])
-            else:
-                clauses.append([in_a])
-        return clauses, arg_map, var_map
\ No newline at end of file
+        n_jobs = resolve_n_jobs(self.n_jobs, self.num_samples)
+        # Independent child seeds keep the per-chunk random streams uncorrelated.
+        seeds = np.random.SeedSequence().spawn(n_jobs)
+        chunk_sizes = [self.num_samples // n_jobs + (i < self.num_samples % n_jobs) for i in range(n_jobs)]
+        if n_jobs == 1:
+            chunk_counts = [self._run_chunk(seeds[0], chunk_sizes[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                chunk_counts = list(executor.map(self._run_chunk, seeds, chunk_sizes))
+
+        acceptance_counts = np.sum(chunk_counts, axis=0)
+        self._scores = dict(zip(self.all_nodes, (acceptance_counts / self.num_samples).tolist()))
+
+    def _add_closure_scores(self, scores: np.ndarray, group: int, closure: int) -> None:
+        """
+        Adds to scores, for every argument in group, the probability that it is
+        credulously accepted, enumerating the subgraphs induced by subsets of closure.
+        """
+        closure_size = closure.bit_count()
+        in_probs = [self.p ** k for k in range(closure_size + 1)]
+        out_probs = [(1 - self.p) ** k for k in range(closure_size + 1)]
+        # Iterate over the non-empty subsets of the closure that keep a group member.
+        active = closure
+        while active:
+            if active & group:
+                num_in = active.bit_count()
+                subgraph_prob = in_probs[num_in] * out_probs[closure_size - num_in]
+                for i in self._iter_bits(self._credulously_accepted(active) & group):
+                    scores[i] += subgraph_prob
+            active = (active - 1) & closure
+
+    def _ancestor_groups(self) -> List[tuple]:
+        """
+        Returns (component, closure) bitset pairs, one per strongly connected
+        component, where closure is the component together with all of its ancestors.
+        """
+        condensation = nx.condensation(self.af)
+        closures = {}
+        groups = []
+        for c in nx.topological_sort(condensation):
+            group = self._mask_of(condensation.nodes[c]['members'])
+            closure = group
+            for pred in condensation.predecessors(c):
+                closure |= closures[pred]
+            closures[c] = closure
+            groups.append((group, closure))
+        return groups
+
+    def _run_chunk(self, seed: np.random.SeedSequence, num_samples: int) -> np.ndarray:
+        """Runs num_samples Monte Carlo trials and returns per-argument acceptance counts."""
+        num_nodes = len(self.all_nodes)
+        row_bytes = (num_nodes + 7) // 8
+        block_rows = max(1, SAMPLE_BLOCK_SIZE // max(num_nodes, 1))
+        acceptance_counts = np.zeros(num_nodes, dtype=np.int64)
+        # Accepted bitsets are collected as bytes and counted a block at a time.
+        accepted_rows = []
+        for active in self._sample_masks(np.random.default_rng(seed), num_samples):
+            if active:
+                accepted_rows.append(self._credulously_accepted(active).to_bytes(row_bytes, 'little'))
+            if len(accepted_rows) == block_rows:
+                acceptance_counts += self._count_bits(accepted_rows, num_nodes)
+                accepted_rows = []
+        if accepted_rows:
+            acceptance_counts += self._count_bits(accepted_rows, num_nodes)
+        return acceptance_counts
+
+    @staticmethod
+    def _count_bits(rows: List[bytes], num_nodes: int) -> np.ndarray:
+        """Per-position counts of the set bits over little-endian bitset rows."""
+        packed = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1)
+        bits = np.unpackbits(packed, axis=1, count=num_nodes, bitorder='little')
+        return bits.sum(axis=0, dtype=np.int64)
+
+    def _credulously_accepted(self, active: int) -> int:
+        """
+        Union of all extensions of the subgraph induced by active, memoized on
+        the non-isolated part of the mask.
+        """
+        isolated = active & self._isolated
+        core = active ^ isolated
+        credulously_accepted = self._accepted_cache.get(core)
+        if credulously_accepted is None:
+            credulously_accepted = 0
+            for ext in self._find_extensions_in_mask(core):
+                credulously_accepted |= ext
+            self._accepted_cache[core] = credulously_accepted
+        return credulously_accepted | isolated
+
+    def _sample_masks(self, rng: np.random.Generator, num_samples: int):
+        """
+        Yields num_samples random subgraphs as bitsets, each argument kept
+        independently with probability p. Samples are drawn and bit-packed in
+        vectorized blocks rather than one RNG call per sample.
+        """
+        num_nodes = len(self.all_nodes)
+        row_bytes = (num_nodes + 7) // 8
+        block_rows = max(1, SAMPLE_BLOCK_SIZE // max(num_nodes, 1))
+        remaining = num_samples
+        while remaining > 0:
+            rows = min(block_rows, remaining)
+            remaining -= rows
+            kept = rng.random((rows, num_nodes), dtype=np.float32) < self.p
+            packed = np.packbits(kept, axis=1, bitorder='little').tobytes()
+            for start in range(0, rows * row_bytes, row_bytes):
+                yield int.from_bytes(packed[start:start + row_bytes], 'little')
@@ -1,5 +1,7 @@
 import networkx as nx
-from typing import List, FrozenSet, Any
+import numpy as np
+from typing import List, Optional
+from util.sat import SOLVER_REBUILD_INTERVAL
 from .prob_base import ProbabilisticSemantics
 
 try:
@@ -7,33 +9,202 @@ try:
 except ImportError:
     pysat = None
 
+# Subgraphs with at most this many arguments are labelled by backtracking instead of SAT.
+LABELLING_MAX_ARGS = 12
+
 class ProbComplete(ProbabilisticSemantics):
     """
     Probabilistic ranking based on complete semantics.
     Uses a state-of-the-art SAT-based algorithm to find all complete extensions.
     """
-    def _find_extensions_in_subgraph(self, subgraph: nx.DiGraph) -> List[FrozenSet[Any]]:
+    def __init__(self, af: nx.DiGraph, num_samples: int = 10000, p: float = 0.5, n_jobs: int = 1):
+        super().__init__(af, num_samples=num_samples, p=p, n_jobs=n_jobs)
+        # One incremental solver holds the encoding of the full framework; subgraphs
+        # are selected per call through assumptions on the existence variables.
+        self._encoding = None
+        self._solver = None
+        self._solver_calls = 0
+        self._next_selector = 0
+
+    def __getstate__(self):
+        # SAT solvers cannot be pickled; worker processes build their own.
+        state = super().__getstate__()
+        state['_solver'] = None
+        return state
+
+    def _get_incremental_encoding(self) -> List[List[int]]:
+        """
+        Complete-labelling CNF of the full framework, relative to existence variables.
+        For the argument at position i, variable i+1 states that it exists, N+i+1
+        that it is in, 2N+i+1 that it is out, and 3N+i+1 that it is out or absent.
+        A non-existing argument is neither in nor out and never defeats anything.
+        """
+        N = len(self.all_nodes)
+        clauses = []
+        for a in range(N):
+            exists_a, in_a, out_a, gone_a = a + 1, N + a + 1, 2 * N + a + 1, 3 * N + a + 1
+            clauses.extend([[-in_a, exists_a], [-out_a, exists_a], [-in_a, -out_a]])
+            clauses.extend([[-gone_a, out_a, -exists_a], [gone_a, -out_a], [gone_a, exists_a]])
+            attackers = list(self._iter_bits(self._attackers[a]))
+            # out iff an attacker is in; in iff every attacker is out or absent.
+            clauses.append([-out_a] + [N + b + 1 for b in attackers])
+            for b in attackers:
+                clauses.append([-(N + b + 1), -exists_a, out_a])
+                clauses.append([-in_a, 3 * N + b + 1])
+            clauses.append([-exists_a, in_a] + [-(3 * N + b + 1) for b in attackers])
+        return clauses
+
+    def _find_extensions_in_mask(self, active: int) -> List[int]:
         """
         Finds all complete extensions using an Exhaustive Extension Enumeration (EEE)
         approach with a SAT solver.
         """
-        if not subgraph.nodes:
-            return [frozenset()]
+        if not active:
+            return [0]
+        if active.bit_count() <= LABELLING_MAX_ARGS:
+            return self._enum_complete_labellings(active)
+        if pysat is None:
+            raise ImportError("PySAT library is required for this method. Please install with 'pip install python-sat'")
+
+        solver, selector, assumptions, is_active = self._start_solver_call(active)
+        N = len(self.all_nodes)
+        extensions = []
+        while solver.solve(assumptions=assumptions):
+            in_literals = np.array(solver.get_model()[N:2 * N])
+            # Extract the extension from the 'in' variables of the model
+            extensions.append(self._mask_of_flags(in_literals > 0))
+            # Add a blocking clause to find a different model in the next iteration
+            blocking_clause = (-in_literals[is_active]).tolist()
+            blocking_clause.append(-selector)
+            solver.add_clause(blocking_clause)
+        solver.add_clause([-selector])
+
+        return extensions
+
+    def _find_extension_attacking(self, active: int, targets: int) -> Optional[int]:
+        """
+        Finds a complete extension of the subgraph induced by active that attacks
+        at least one argument in targets, or None if there is none.
+        """
+        attackers = 0
+        for t in self._iter_bits(targets):
+            attackers |= self._attackers[t] & active
+        if not attackers:
+            return None
         if pysat is None:
             raise ImportError("PySAT library is required for this method. Please install with 'pip install python-sat'")
-            
-        clauses, arg_map, var_map = self._get_complete_encoding(subgraph)
-        N = len(var_map)
-        
+
+        solver, selector, assumptions, _ = self._start_solver_call(active)
+        N = len(self.all_nodes)
+        solver.add_clause([-selector] + [N + i + 1 for i in self._iter_bits(attackers)])
+        ext = None
+        if solver.solve(assumptions=assumptions):
+            ext = self._mask_of_flags(np.array(solver.get_model()[N:2 * N]) > 0)
+        solver.add_clause([-selector])
+        return ext
+
+    def _start_solver_call(self, active: int):
+        """
+        Returns the persistent solver, a fresh selector literal guarding the clauses
+        added during this call, the assumptions selecting the active subgraph and
+        a boolean array flagging its arguments. The caller retires the selector
+        with a unit clause when it is done.
+        """
+        N = len(self.all_nodes)
+        if self._solver is None or self._solver_calls >= SOLVER_REBUILD_INTERVAL:
+            if self._solver is not None:
+                self._solver.delete()
+            if self._encoding is None:
+                self._encoding = self._get_incremental_encoding()
+            self._solver = pysat.solvers.Glucose4(bootstrap_with=self._encoding)
+            self._solver_calls = 0
+            self._next_selector = 4 * N + 1
+        self._solver_calls += 1
+
+        selector = self._next_selector
+        self._next_selector += 1
+        is_active = np.unpackbits(np.frombuffer(active.to_bytes((N + 7) // 8, 'little'), dtype=np.uint8),
+                                  count=N, bitorder='little').astype(bool)
+        exists_vars = np.arange(1, N + 1)
+        assumptions = np.where(is_active, exists_vars, -exists_vars).tolist()
+        assumptions.append(selector)
+        return self._solver, selector, assumptions, is_active
+
+    @staticmethod
+    def _mask_of_flags(flags: np.ndarray) -> int:
+        """Bitset of the positions where the boolean array flags is set."""
+        return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+    def _propagate(self, active: int, in_args: int, out_args: int, undec_args: int):
+        """
+        Applies the forced labels of a complete labelling to the unlabelled arguments
+        until nothing changes. Returns the new (in, out, undec) bitsets, or None if
+        the partial labelling cannot be completed.
+        """
+        changed = True
+        while changed:
+            changed = False
+            labelled = in_args | out_args | undec_args
+            for a in self._iter_bits(active & ~labelled):
+                attackers = self._attackers[a] & active
+                if attackers & in_args:
+                    out_args |= 1 << a
+                elif not attackers & ~out_args:
+                    in_args |= 1 << a
+                elif not attackers & ~(out_args | undec_args):
+                    undec_args |= 1 << a
+                else:
+                    continue
+                changed = True
+            labelled = in_args | out_args | undec_args
+            for a in self._iter_bits(in_args):
+                # Every attacker of an 'in' argument must be 'out'.
+                attackers = self._attackers[a] & active
+                if attackers & (in_args | undec_args):
+                    return None
+                if attackers & ~out_args:
+                    out_args |= attackers
+                    changed = True
+            for a in self._iter_bits(out_args):
+                # An 'out' argument needs an attacker that can still be 'in'.
+                candidates = self._attackers[a] & active & ~(out_args | undec_args)
+                if not candidates:
+                    return None
+                if not candidates & in_args and candidates & (candidates - 1) == 0:
+                    in_args |= candidates
+                    changed = True
+            for a in self._iter_bits(undec_args):
+                # An 'undec' argument has no 'in' attacker and some attacker that is not 'out'.
+                attackers = self._attackers[a] & active
+                if attackers & in_args:
+                    return None
+                candidates = attackers & ~out_args
+                if not candidates:
+                    return None
+                if candidates & (candidates - 1) == 0 and not candidates & labelled:
+                    undec_args |= candidates
+                    changed = True
+        return in_args, out_args, undec_args
+
+    def _enum_complete_labellings(self, active: int) -> List[int]:
+        """
+        Enumerates the complete extensions of the subgraph induced by active by
+        depth-first search over in/out/undec labellings, branching on the lowest
+        unlabelled argument after propagating the forced labels.
+        """
         extensions = []
-        with pysat.solvers.Glucose4() as solver:
-            solver.append_formula(clauses)
-            while solver.solve():
-                model = solver.get_model()
-                # Extract the extension from the 'in' variables of the model
-                ext = frozenset({arg_map[v] for v in model if v > 0 and v <= N})
-                extensions.append(ext)
-                # Add a blocking clause to find a different model in the next iteration
-                solver.add_clause([-v for v in model if abs(v) <= N])
-                
-        return extensions
\ No newline at end of file
+        stack = [(0, 0, 0)]
+        while stack:
+            state = self._propagate(active, *stack.pop())
+            if state is None:
+                continue
+            in_args, out_args, undec_args = state
+            unlabelled = active & ~(in_args | out_args | undec_args)
+            if not unlabelled:
+                extensions.append(in_args)
+                continue
+            a = unlabelled & -unlabelled
+            stack.append((in_args, out_args, undec_args | a))
+            stack.append((in_args, out_args | a, undec_args))
+            stack.append((in_args | a, out_args, undec_args))
+        return extensions
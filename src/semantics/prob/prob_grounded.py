@@ -1,31 +1,213 @@
 import networkx as nx
-from typing import List, FrozenSet, Any
+import numpy as np
+from typing import List
 from .prob_base import ProbabilisticSemantics
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# The compiled closure enumeration is split on this many of the closure's highest
+# bits into chunks that run in parallel.
+CLOSURE_SPLIT_BITS = 6
+
 class ProbGrounded(ProbabilisticSemantics):
     """
     Probabilistic ranking based on the grounded semantics.
     Uses an efficient iterative algorithm to find the unique grounded extension.
     """
-    def _find_extensions_in_subgraph(self, subgraph: nx.DiGraph) -> List[FrozenSet[Any]]:
-        """
-        Calculates the unique grounded extension of the given subgraph.
-        """
-        if not subgraph.nodes:
-            return [frozenset()]
-
-        accepted_args = set()
-        while True:
-            # Find all arguments that are defended by the current accepted set.
-            newly_accepted = {
-                n for n in subgraph.nodes if n not in accepted_args and
-                all(any(subgraph.has_edge(d, att) for d in accepted_args) for att in subgraph.predecessors(n))
-            }
-            
-            # If no new arguments were accepted, we have reached the fixpoint.
-            if not newly_accepted:
-                break
-                
-            accepted_args.update(newly_accepted)
-            
-        return [frozenset(accepted_args)]
\ No newline at end of file
+    def __init__(self, af: nx.DiGraph, num_samples: int = 10000, p: float = 0.5, n_jobs: int = 1):
+        super().__init__(af, num_samples=num_samples, p=p, n_jobs=n_jobs)
+        # Row i holds the attackers / attacked arguments of argument i as little-endian
+        # uint64 words, the layout expected by the compiled fixpoint kernel.
+        self._num_words = max(1, (len(self.all_nodes) + 63) // 64)
+        if _grounded_fixpoint is not None:
+            self._attacker_words = np.array([self._to_words(m) for m in self._attackers], dtype=np.uint64)
+            self._attack_words = np.array([self._to_words(m) for m in self._attacks], dtype=np.uint64)
+            self._attacker_words = self._attacker_words.reshape(len(self.all_nodes), self._num_words)
+            self._attack_words = self._attack_words.reshape(len(self.all_nodes), self._num_words)
+            if self._num_words == 1:
+                # Frameworks of at most 64 arguments use the scalar single-word kernels,
+                # which skip the word-array conversions on every call.
+                self._attacker_word = np.ascontiguousarray(self._attacker_words[:, 0])
+                self._attack_word = np.ascontiguousarray(self._attack_words[:, 0])
+
+        # Strongly connected components in topological order of the condensation. An
+        # argument's status only depends on its own and earlier components, so each
+        # component is settled once, by a fixpoint over its own members.
+        condensation = nx.condensation(self.af)
+        components = [sorted(self._node_index[node] for node in condensation.nodes[c]['members'])
+                      for c in nx.topological_sort(condensation)]
+        self._scc_masks: List[int] = [self._mask_of(self.all_nodes[i] for i in members) for members in components]
+        self._scc_order = np.array([i for members in components for i in members], dtype=np.int64)
+        self._scc_starts = np.cumsum([0] + [len(members) for members in components], dtype=np.int64)
+
+    def _add_closure_scores(self, scores: np.ndarray, group: int, closure: int) -> None:
+        """
+        Runs the whole enumeration of the closure's subsets in compiled code when
+        the framework fits into a single 64-bit word.
+        """
+        if _closure_scores is None or self._num_words != 1:
+            super()._add_closure_scores(scores, group, closure)
+            return
+        closure_size = closure.bit_count()
+        in_probs = self.p ** np.arange(closure_size + 1, dtype=np.float64)
+        out_probs = (1 - self.p) ** np.arange(closure_size + 1, dtype=np.float64)
+        _closure_scores(np.uint64(group), np.uint64(closure), self._attacker_word, self._attack_word,
+                        self._scc_order, self._scc_starts, in_probs, out_probs, scores)
+
+    def _to_words(self, mask: int) -> np.ndarray:
+        return np.frombuffer(mask.to_bytes(self._num_words * 8, 'little'), dtype='<u8')
+
+    def _find_extensions_in_mask(self, active: int) -> List[int]:
+        """
+        Calculates the unique grounded extension of the subgraph induced by active.
+        """
+        if not active:
+            return [0]
+
+        if _grounded_fixpoint is not None and self._num_words == 1:
+            return [int(_grounded_fixpoint_word(np.uint64(active), self._attacker_word, self._attack_word,
+                                                self._scc_order, self._scc_starts))]
+        if _grounded_fixpoint is not None:
+            accepted_words = _grounded_fixpoint(self._to_words(active), self._attacker_words, self._attack_words,
+                                                self._scc_order, self._scc_starts)
+            return [int.from_bytes(accepted_words.tobytes(), 'little')]
+
+        accepted_args = 0
+        defeated_args = 0
+        for scc_mask in self._scc_masks:
+            scc_active = scc_mask & active
+            while scc_active:
+                # Find all arguments of the component whose active attackers are all
+                # attacked by the current accepted set.
+                newly_accepted = 0
+                for n in self._iter_bits(scc_active & ~accepted_args):
+                    if not self._attackers[n] & active & ~defeated_args:
+                        newly_accepted |= 1 << n
+
+                accepted_args |= newly_accepted
+                defeated_args |= self._attacked_by(newly_accepted)
+
+                # If no new arguments were accepted, the component has reached its fixpoint;
+                # a single-argument component is settled by one sweep.
+                if not newly_accepted or not scc_mask & (scc_mask - 1):
+                    break
+
+        return [accepted_args]
+
+if njit is not None:
+    @njit(cache=True)
+    def _grounded_fixpoint(active, attacker_words, attack_words, scc_order, scc_starts):
+        """
+        Grounded extension of the subgraph induced by the active word bitset.
+        An argument is accepted once all of its active attackers are attacked
+        by accepted arguments. Components are visited in topological order and
+        swept until nothing changes within them.
+        """
+        num_words = attacker_words.shape[1]
+        accepted = np.zeros(num_words, dtype=np.uint64)
+        defeated = np.zeros(num_words, dtype=np.uint64)
+        for c in range(len(scc_starts) - 1):
+            # A single-argument component is settled by one sweep.
+            changed = True
+            while changed:
+                changed = False
+                for idx in range(scc_starts[c], scc_starts[c + 1]):
+                    n = scc_order[idx]
+                    word = n >> 6
+                    bit = np.uint64(1) << np.uint64(n & 63)
+                    if (active[word] & bit) == 0 or (accepted[word] & bit) != 0:
+                        continue
+                    is_defended = True
+                    for k in range(num_words):
+                        if attacker_words[n, k] & active[k] & ~defeated[k]:
+                            is_defended = False
+                            break
+                    if is_defended:
+                        accepted[word] |= bit
+                        for k in range(num_words):
+                            defeated[k] |= attack_words[n, k] & active[k]
+                        changed = scc_starts[c + 1] - scc_starts[c] > 1
+        return accepted
+
+    @njit(cache=True)
+    def _popcount(word):
+        count = 0
+        while word:
+            word &= word - np.uint64(1)
+            count += 1
+        return count
+
+    @njit(cache=True)
+    def _grounded_fixpoint_word(active, attackers, attacks, scc_order, scc_starts):
+        """Single-word variant of _grounded_fixpoint for frameworks of at most 64 arguments."""
+        one = np.uint64(1)
+        accepted = np.uint64(0)
+        defeated = np.uint64(0)
+        for c in range(len(scc_starts) - 1):
+            changed = True
+            while changed:
+                changed = False
+                for idx in range(scc_starts[c], scc_starts[c + 1]):
+                    n = scc_order[idx]
+                    bit = one << np.uint64(n)
+                    if (active & bit) == 0 or (accepted & bit) != 0:
+                        continue
+                    if attackers[n] & active & ~defeated:
+                        continue
+                    accepted |= bit
+                    defeated |= attacks[n] & active
+                    changed = scc_starts[c + 1] - scc_starts[c] > 1
+        return accepted
+
+    @njit(cache=True, parallel=True)
+    def _closure_scores(group, closure, attackers, attacks, scc_order, scc_starts, in_probs, out_probs, scores):
+        """
+        Adds to scores, for every argument in group, the probability of it being in
+        the grounded extension, summed over all subsets of closure keeping a group member.
+        Subsets are split by their highest closure bits into chunks enumerated in parallel,
+        each accumulating into its own row of partial scores.
+        """
+        one = np.uint64(1)
+        closure_size = _popcount(closure)
+        num_split = min(closure_size, CLOSURE_SPLIT_BITS)
+        split_positions = np.empty(num_split, dtype=np.uint64)
+        low_closure = closure
+        for k in range(num_split):
+            # Clear the highest remaining bit of the closure.
+            position = np.uint64(63)
+            while (low_closure >> position) & one == 0:
+                position -= one
+            split_positions[k] = position
+            low_closure ^= one << position
+
+        num_chunks = 1 << num_split
+        partial_scores = np.zeros((num_chunks, scores.shape[0]))
+        for chunk in prange(num_chunks):
+            high = np.uint64(0)
+            for k in range(num_split):
+                if (chunk >> k) & 1:
+                    high |= one << split_positions[k]
+            low = low_closure
+            while True:
+                active = low | high
+                if active & group:
+                    num_in = _popcount(active)
+                    subgraph_prob = in_probs[num_in] * out_probs[closure_size - num_in]
+                    accepted = _grounded_fixpoint_word(active, attackers, attacks, scc_order, scc_starts) & group
+                    while accepted:
+                        lowest = accepted & (~accepted + one)
+                        i = 0
+                        while (lowest >> np.uint64(i)) != one:
+                            i += 1
+                        partial_scores[chunk, i] += subgraph_prob
+                        accepted ^= lowest
+                if low == 0:
+                    break
+                low = (low - one) & low_closure
+        scores += partial_scores.sum(axis=0)
+else:
+    _grounded_fixpoint = None
+    _closure_scores = None
@@ -1,6 +1,7 @@
 import networkx as nx
-from typing import List, FrozenSet, Any, Set, Optional
+from typing import List, Optional
 from .prob_base import ProbabilisticSemantics
+from .prob_complete import LABELLING_MAX_ARGS, ProbComplete
 
 try:
     import pysat.solvers
@@ -13,60 +14,55 @@ class ProbIdeal(ProbabilisticSemantics):
     Uses the CDIS algorithm to find the unique ideal extension
     without enumerating all preferred extensions.
     """
-    def _find_admissible_attacker_of(self, subgraph: nx.DiGraph, candidate_set_P: Set[Any]) -> Optional[Set[Any]]:
+    def __init__(self, af: nx.DiGraph, num_samples: int = 10000, p: float = 0.5, n_jobs: int = 1):
+        super().__init__(af, num_samples=num_samples, p=p, n_jobs=n_jobs)
+        # One complete semantics solver is shared by every sampled subgraph.
+        self._complete_finder = ProbComplete(af, num_samples=num_samples, p=p)
+
+    def _find_admissible_attacker_of(self, active: int, candidate_set_P: int) -> Optional[int]:
         """
-        Finds an admissible set S that attacks at least one argument in the candidate set P.
+        Finds an admissible set S (as a bitset) that attacks at least one argument
+        in the candidate set P, within the subgraph induced by active.
         """
         if not candidate_set_P:
             return None
-        
-        clauses, arg_map, var_map = self._get_complete_encoding(subgraph)
-        N = len(var_map)
-
-        with pysat.solvers.Glucose4() as solver:
-            solver.append_formula(clauses)
-            potential_attacker_vars = {var_map[s] for p in candidate_set_P for s in subgraph.predecessors(p) if s in var_map}
-            
-            if not potential_attacker_vars:
-                return None
-
-            solver.add_clause(list(potential_attacker_vars))
-            
-            if solver.solve():
-                model = solver.get_model()
-                return {arg_map[v] for v in model if v > 0 and v <= N}
-        return None
+        # Complete extensions are admissible, so the shared complete solver suffices.
+        return self._complete_finder._find_extension_attacking(active, candidate_set_P)
 
-    def _find_extensions_in_subgraph(self, subgraph: nx.DiGraph) -> List[FrozenSet[Any]]:
+    def _find_extensions_in_mask(self, active: int) -> List[int]:
         """
         Finds the unique ideal extension using the CDIS algorithm.
         """
-        if not subgraph.nodes:
-            return [frozenset()]
-        if pysat is None:
-            raise ImportError("PySAT library is required for this method. Please install with 'pip install python-sat'")
+        if not active:
+            return [0]
 
         # Phase 1: Compute the Preferred Super-Core (P)
-        P = set(subgraph.nodes)
-        while True:
-            S = self._find_admissible_attacker_of(subgraph, P)
-            if not S:
-                break
-            
-            attacked_by_S = {target for s_arg in S for target in subgraph.successors(s_arg)}
-            P -= attacked_by_S
-        
+        P = active
+        if active.bit_count() <= LABELLING_MAX_ARGS:
+            # Every complete extension that attacks P is eventually removed from it, so
+            # on small subgraphs P is what no complete extension attacks.
+            for ext in self._complete_finder._enum_complete_labellings(active):
+                P &= ~self._attacked_by(ext)
+        else:
+            if pysat is None:
+                raise ImportError("PySAT library is required for this method. Please install with 'pip install python-sat'")
+            while True:
+                S = self._find_admissible_attacker_of(active, P)
+                if not S:
+                    break
+
+                P &= ~self._attacked_by(S)
         # Phase 2: Compute the largest admissible set within P
-        p_subgraph = subgraph.subgraph(P).copy()
         while True:
-            removed_in_iteration = {
-                p_arg for p_arg in p_subgraph.nodes() if not 
-                all(any(p_subgraph.has_edge(d, att) for d in p_subgraph.nodes()) for att in p_subgraph.predecessors(p_arg))
-            }
+            defeated_by_P = self._attacked_by(P)
+            removed_in_iteration = 0
+            for p_arg in self._iter_bits(P):
+                if self._attackers[p_arg] & P & ~defeated_by_P:
+                    removed_in_iteration |= 1 << p_arg
             
             if not removed_in_iteration:
                 break
             
-            p_subgraph.remove_nodes_from(removed_in_iteration)
+            P &= ~removed_in_iteration
 
-        return [frozenset(p_subgraph.nodes())]
\ No newline at end of file
+        return [P]
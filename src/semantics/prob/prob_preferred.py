@@ -1,5 +1,5 @@
 import networkx as nx
-from typing import List, FrozenSet, Any
+from typing import List
 from .prob_base import ProbabilisticSemantics
 from .prob_complete import ProbComplete
 
@@ -8,30 +8,32 @@ class ProbPreferred(ProbabilisticSemantics):
     Probabilistic ranking based on preferred semantics.
     Finds all preferred extensions by filtering the set of all complete extensions.
     """
-    def _find_extensions_in_subgraph(self, subgraph: nx.DiGraph) -> List[FrozenSet[Any]]:
+    def __init__(self, af: nx.DiGraph, num_samples: int = 10000, p: float = 0.5, n_jobs: int = 1):
+        super().__init__(af, num_samples=num_samples, p=p, n_jobs=n_jobs)
+        # One complete semantics solver is shared by every sampled subgraph.
+        self._complete_finder = ProbComplete(af, num_samples=num_samples, p=p)
+
+    def _find_extensions_in_mask(self, active: int) -> List[int]:
         """
         Finds all preferred extensions by first finding all complete extensions
         and then identifying the maximal ones.
         """
-        if not subgraph.nodes:
-            return [frozenset()]
+        if not active:
+            return [0]
 
         # Reuse the complete semantics solver to get all complete extensions
-        complete_finder = ProbComplete(subgraph)
-        complete_exts = complete_finder._find_extensions_in_subgraph(subgraph)
+        complete_exts = self._complete_finder._find_extensions_in_mask(active)
 
         if not complete_exts:
             return []
 
-        # Filter for maximal sets (preferred extensions)
+        # Filter for maximal sets (preferred extensions). Visiting candidates by
+        # decreasing size means every proper superset of a set has been seen before
+        # it, and a dominated superset is itself below a preferred extension, so only
+        # the preferred extensions found so far need to be compared against.
         preferred_extensions = []
-        for s1 in complete_exts:
-            is_maximal = True
-            for s2 in complete_exts:
-                if s1 != s2 and s1.issubset(s2):
-                    is_maximal = False
-                    break
-            if is_maximal:
+        for s1 in sorted(complete_exts, key=int.bit_count, reverse=True):
+            if not any(not s1 & ~s2 for s2 in preferred_extensions):
                 preferred_extensions.append(s1)
                 
         return preferred_extensions
\ No newline at end of file
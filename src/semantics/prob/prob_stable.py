@@ -1,6 +1,7 @@
 # semantics/prob/prob_stable.py
 
 import networkx as nx
+import numpy as np
 import math
 
 class ProbStable:
@@ -24,32 +25,23 @@ class ProbStable:
         """
         Computes the log-score for each argument 'a' as log(Pr({a} is stable)).
         """
-        self._scores = {}
-        
         # Pre-calculate logs for efficiency
         log_p = math.log(self.p)
         log_1_minus_p = math.log(1 - self.p)
 
-        for i, arg_a in enumerate(self.all_nodes):
-            # print(f"\rCalculating analytical log-score for argument {i+1}/{self.num_nodes}...", end="")
-
-            # 1. Log-probability that 'a' itself exists.
-            log_prob_a_exists = log_p
-
-            # 2. Check for conflict-freeness. If conflicting, log-prob is -infinity.
-            if self.af.has_edge(arg_a, arg_a):
-                self._scores[arg_a] = -math.inf
-                continue
-
-            # 3. Log-probability that {a} attacks every other existing argument 'd'.
-            # This is the sum of log-probabilities over all d != a.
-            # log(Pr) = num_non_attacked * log(1-p)
-            out_degree_a = self.af.out_degree(arg_a)
-            num_non_attacked = (self.num_nodes - 1) - out_degree_a
-            
-            log_prob_attacks_external = num_non_attacked * log_1_minus_p
-            
-            # The final log-score is the sum of the log-probabilities.
-            self._scores[arg_a] = log_prob_a_exists + log_prob_attacks_external
-        
-        # print("\rAnalytical calculation complete.                      ")
\ No newline at end of file
+        # 1. Log-probability that 'a' itself exists: log_p.
+        # 2. Conflict-freeness: a self-attacking 'a' gets log-prob -infinity.
+        has_self_attack = np.fromiter((self.af.has_edge(a, a) for a in self.all_nodes),
+                                      dtype=bool, count=self.num_nodes)
+
+        # 3. Log-probability that {a} attacks every other existing argument 'd'.
+        # This is the sum of log-probabilities over all d != a.
+        # log(Pr) = num_non_attacked * log(1-p)
+        out_degree = np.fromiter((d for _, d in self.af.out_degree(self.all_nodes)),
+                                 dtype=np.int64, count=self.num_nodes)
+        num_non_attacked = (self.num_nodes - 1) - out_degree
+
+        # The final log-score is the sum of the log-probabilities.
+        scores = log_p + num_non_attacked * log_1_minus_p
+        scores[has_self_attack] = -math.inf
+        self._scores = dict(zip(self.all_nodes, scores.tolist()))
@@ -2,40 +2,89 @@
 
 import os
 import time
-from typing import List, Set, FrozenSet, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Set, Dict, Any
 from pysat.solvers import Glucose4
 import networkx as nx
+import numpy as np
+
+from util.parallel import resolve_n_jobs
+from util.sat import SOLVER_REBUILD_INTERVAL
 
 class Ser:
     """
     Implements the serialisability-based ranking semantics using a SAT-based
     approach to find initial sets, as described by Bengel & Thimm (2023).
     """
-    def __init__(self, af: nx.DiGraph, max_recursion_depth: int = 15):
+    def __init__(self, af: nx.DiGraph, max_recursion_depth: int = 15, n_jobs: int = 1):
         if not isinstance(af, nx.DiGraph):
             raise TypeError("Argumentation framework must be a NetworkX DiGraph.")
 
         self.af = af
         self.original_arguments = set(af.nodes)
         self.max_depth = max_recursion_depth
+        # Number of processes sharing the step-1 branches (-1 uses every core).
+        self.n_jobs = n_jobs
+
+        # CSR predecessor (attacker) lists over the sorted arguments, built once so
+        # that the recursion never walks networkx dicts.
+        self.arguments = sorted(self.original_arguments)
+        self.arg_to_index = {arg: i for i, arg in enumerate(self.arguments)}
+        self._edges = np.array([(self.arg_to_index[u], self.arg_to_index[v]) for u, v in af.edges],
+                               dtype=np.int32).reshape(-1, 2)
+        self._pred_indptr, self._pred_indices = self._to_csr(self._edges[:, 1], self._edges[:, 0])
+        # Sets of arguments in the recursion are Python-int bitsets over the same positions;
+        # bit j of _attacks[i] is set iff i attacks j; bit j of _attackers[i] iff j attacks i.
+        self._attacks: List[int] = [0] * len(self.arguments)
+        self._attackers: List[int] = [0] * len(self.arguments)
+        for i, j in self._edges.tolist():
+            self._attacks[i] |= 1 << j
+            self._attackers[j] |= 1 << i
+        self._self_attacking = sum(1 << i for i in range(len(self.arguments)) if self._attacks[i] >> i & 1)
+
+        # One incremental solver holds the admissibility encoding of the full framework;
+        # reducts are selected per call through assumptions on the existence variables.
+        self._encoding = None
+        self._solver = None
+        self._solver_calls = 0
+        self._next_selector = 0
+        self._reduct_cache: Dict[int, List[int]] = {}
         
         self._serialisation_indices: Dict[Any, float] = {arg: float('inf') for arg in self.original_arguments}
         self._ranking: List[Set[Any]] = []
+        # Bit i of _settled[k] is set once the argument at position i has an index of
+        # at most k, so a reduct can only improve at step k if it has bits outside it.
+        self._settled: List[int] = [0] * (max(max_recursion_depth, 1) + 1)
 
-        self._calculate_ranking_hybrid_pruned()
+        try:
+            self._calculate_ranking_hybrid_pruned()
+        finally:
+            # The solver is only needed while the ranking is computed, including
+            # when that ends early or with an error.
+            if self._solver is not None:
+                self._solver.delete()
+                self._solver = None
 
     def _calculate_ranking_hybrid_pruned(self):
         """Calculates serialisation indices using the SAT-powered hybrid approach."""
-        initial_sets_step1 = self._find_initial_sets_sat(self.af)
+        initial_sets_step1 = self._find_initial_sets_sat((1 << len(self.arguments)) - 1)
         if not initial_sets_step1:
             return
 
         for s in initial_sets_step1:
-            for arg in s:
-                self._serialisation_indices[arg] = 1
+            self._lower_indices(s, 1)
         
-        for s_i in initial_sets_step1:
-            self._explore_sequences_pruned(frozenset(s_i), 2)
+        n_jobs = resolve_n_jobs(self.n_jobs, len(initial_sets_step1))
+        if n_jobs == 1:
+            self._explore_branches(initial_sets_step1)
+        else:
+            # Branches only interact through the indices, which are merged by taking
+            # the minimum; each worker prunes against its own view of them.
+            branch_chunks = [initial_sets_step1[i::n_jobs] for i in range(n_jobs)]
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                for settled in list(executor.map(self._explore_branches, branch_chunks)):
+                    for step in range(1, len(settled)):
+                        self._lower_indices(settled[step], step)
         
         sorted_args = sorted(list(self.original_arguments), key=lambda arg: (self._serialisation_indices[arg], str(arg)))
         if sorted_args:
@@ -43,114 +92,204 @@ class Ser:
             for key, group in groupby(sorted_args, key=lambda arg: self._serialisation_indices[arg]):
                 self._ranking.append(set(group))
 
-    def _explore_sequences_pruned(self, accepted_set: FrozenSet[Any], step: int):
-        """Recursively explores sequences, pruning branches that cannot improve results."""
+    def __getstate__(self):
+        # The Glucose4 handle stays in this process; each branch worker starts its
+        # own solver from the pickled _encoding.
+        state = self.__dict__.copy()
+        state['_solver'] = None
+        return state
+
+    def _explore_branches(self, initial_sets: List[int]) -> List[int]:
+        """
+        Explores the sequences starting with the given step-1 initial sets and
+        returns the resulting settled bitsets.
+        """
+        for s_i in initial_sets:
+            self._explore_sequences_pruned(s_i, 2)
+        return self._settled
+
+    def _explore_sequences_pruned(self, accepted_set: int, step: int):
+        """
+        Recursively explores sequences, pruning branches that cannot improve results.
+        The accepted set and the reduct are bitsets over the positions in self.arguments.
+        """
         if step > self.max_depth: return
         attacked_by_accepted = self._get_attacked_set(accepted_set)
-        nodes_for_reduct = self.original_arguments - accepted_set - attacked_by_accepted
+        nodes_for_reduct = ((1 << len(self.arguments)) - 1) & ~accepted_set & ~attacked_by_accepted
 
-        can_improve = any(self._serialisation_indices[arg] > step for arg in nodes_for_reduct)
+        can_improve = nodes_for_reduct & ~self._settled[step]
         if not can_improve: return
 
-        current_subgraph = self.af.subgraph(nodes_for_reduct)
-        initial_sets = self._find_initial_sets_sat(current_subgraph)
+        # Different sequences often lead to the same reduct, whose initial sets are reused.
+        initial_sets = self._reduct_cache.get(nodes_for_reduct)
+        if initial_sets is None:
+            initial_sets = self._find_initial_sets_sat(nodes_for_reduct)
+            self._reduct_cache[nodes_for_reduct] = initial_sets
         if not initial_sets: return
 
         for s_i in initial_sets:
-            for arg in s_i:
-                self._serialisation_indices[arg] = min(self._serialisation_indices[arg], step)
-            new_accepted_set = accepted_set.union(s_i)
-            self._explore_sequences_pruned(new_accepted_set, step + 1)
-
-    def _get_attacked_set(self, source_set: Set[Any]) -> Set[Any]:
-        attacked = set()
-        for arg in source_set: attacked.update(self.af.successors(arg))
+            self._lower_indices(s_i, step)
+            self._explore_sequences_pruned(accepted_set | s_i, step + 1)
+
+    def _lower_indices(self, s_i: int, step: int):
+        """Lowers the serialisation index of every argument in the bitset s_i to at most step."""
+        for i in self._iter_bits(s_i & ~self._settled[step]):
+            self._serialisation_indices[self.arguments[i]] = step
+        for k in range(step, len(self._settled)):
+            self._settled[k] |= s_i
+
+    def _to_csr(self, rows: np.ndarray, cols: np.ndarray):
+        """Index pointer and sorted column arrays of the adjacency lists rows -> cols."""
+        order = np.lexsort((cols, rows))
+        counts = np.bincount(rows, minlength=len(self.arguments))
+        indptr = np.zeros(len(self.arguments) + 1, dtype=np.int32)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr, cols[order].astype(np.int32)
+
+    def _predecessors(self, i: int) -> np.ndarray:
+        return self._pred_indices[self._pred_indptr[i]:self._pred_indptr[i + 1]]
+
+    @staticmethod
+    def _iter_bits(mask: int):
+        """Yields the positions of the set bits of mask in increasing order."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _get_attacked_set(self, source_set: int) -> int:
+        attacked = 0
+        for i in self._iter_bits(source_set):
+            attacked |= self._attacks[i]
         return attacked
         
-    def _find_initial_sets_sat(self, graph: nx.DiGraph) -> List[FrozenSet[Any]]:
+    def _find_initial_sets_sat(self, active: int) -> List[int]:
         """
-        Finds all initial sets in a graph using a SAT solver.
-        This function encodes the properties of a minimal non-empty admissible set
-        into a SAT formula and iteratively queries a solver.
+        Finds all initial sets (as bitsets) of the reduct induced by the active bitset
+        using a SAT solver. This function encodes the properties of a minimal non-empty
+        admissible set into a SAT formula and iteratively queries a solver.
         """
-        if not graph.nodes:
+        if not active:
             return []
 
-        nodes = sorted(list(graph.nodes()))
-        arg_map = {arg: i + 1 for i, arg in enumerate(nodes)}
+        N = len(self.arguments)
+        is_active = np.unpackbits(np.frombuffer(active.to_bytes((N + 7) // 8, 'little'), dtype=np.uint8),
+                                  count=N, bitorder='little').astype(bool)
+        solver, selector, exists_assumptions = self._start_solver_call(is_active)
         
         initial_sets = []
+
+        # A singleton {a} that counter-attacks all of its attackers is an initial set.
+        # These are collected without solving and blocked before the solver runs.
+        for a in self._iter_bits(active & ~self._self_attacking):
+            if not self._attackers[a] & active & ~self._attacks[a]:
+                initial_sets.append(1 << a)
+                solver.add_clause([-(a + 1), -selector])
         
-        # Base clauses for being an admissible, non-empty set
-        base_clauses = self._encode_admissible(graph, arg_map)
-        base_clauses.append([v for v in arg_map.values()]) # Must be non-empty
-
-        with Glucose4(bootstrap_with=base_clauses) as solver:
-            while solver.solve():
-                model = solver.get_model()
-                current_admissible_set = frozenset(nodes[i] for i, v in enumerate(model) if v > 0 and v < len(nodes) + 1)
-                
-                # Check for minimality by seeing if a proper subset is also admissible.
-                is_minimal = True
-                if len(current_admissible_set) > 1:
-                    # Create a new, temporary problem to search for a smaller set.
-                    # It inherits the base rules of admissibility.
-                    with Glucose4(bootstrap_with=base_clauses) as min_check_solver:
-                        # Constraint: The solution must be a SUBSET of the current set.
-                        # For every argument NOT in our current set, it cannot be in the solution.
-                        for node in nodes:
-                            if node not in current_admissible_set:
-                                min_check_solver.add_clause([-arg_map[node]])
-                        
-                        # Constraint: The solution must be a PROPER subset.
-                        # At least one argument FROM our current set must be excluded.
-                        min_check_solver.add_clause([-arg_map[arg] for arg in current_admissible_set])
-                        
-                        if min_check_solver.solve():
-                            # A smaller admissible set exists, so the current one is not minimal.
-                            is_minimal = False
-
-                if is_minimal:
-                    initial_sets.append(current_admissible_set)
-                    # Block this minimal model from being found again.
-                    blocking_clause = [-arg_map[arg] for arg in current_admissible_set]
-                    solver.add_clause(blocking_clause)
-                else:
-                    # The found set was not minimal. Block it and force the solver to
-                    # find a different (possibly smaller) solution in the next iteration.
-                    blocking_clause = [-arg_map[arg] if arg in current_admissible_set else arg_map[arg] for arg in nodes]
-                    # This clause is complex, a simpler way is to just block the found model
-                    blocking_clause_simple = [-v for v in model if v > 0 and v <= len(nodes)]
-                    solver.add_clause(blocking_clause_simple)
+        while solver.solve(assumptions=exists_assumptions + [selector]):
+            in_literals = np.array(solver.get_model()[:N])
+            members = int.from_bytes(np.packbits(in_literals > 0, bitorder='little').tobytes(), 'little')
+            # A non-minimal admissible set is shrunk to an initial set inside it. That set
+            # is new, since the supersets of every set found so far are blocked.
+            initial_set = self._shrink_to_initial_set(members, active)
+            initial_sets.append(initial_set)
+            # Block this initial set and all of its supersets from being found again.
+            blocking_clause = [-(i + 1) for i in self._iter_bits(initial_set)]
+            blocking_clause.append(-selector)
+            solver.add_clause(blocking_clause)
+        solver.add_clause([-selector])
 
         return initial_sets
 
+    def _start_solver_call(self, is_active: np.ndarray):
+        """
+        Returns the persistent solver, a fresh selector literal guarding the clauses
+        added during this call and the assumptions selecting the active arguments.
+        The caller retires the selector with a unit clause when it is done.
+        """
+        N = len(self.arguments)
+        if self._solver is None or self._solver_calls >= SOLVER_REBUILD_INTERVAL:
+            if self._solver is not None:
+                self._solver.delete()
+            if self._encoding is None:
+                self._encoding = self._encode_admissible()
+            self._solver = Glucose4(bootstrap_with=self._encoding)
+            # Prefer leaving arguments out, so that models are small admissible sets
+            # that need little shrinking; the existence variables are always assumed.
+            self._solver.set_phases([-(i + 1) for i in range(N)])
+            self._solver_calls = 0
+            self._next_selector = 2 * N + 1
+        self._solver_calls += 1
+
+        exists_vars = np.arange(N + 1, 2 * N + 1)
+        exists_assumptions = np.where(is_active, exists_vars, -exists_vars).tolist()
+        selector = self._next_selector
+        self._next_selector += 1
+        return self._solver, selector, exists_assumptions
 
-    def _encode_admissible(self, graph: nx.DiGraph, arg_map: Dict[Any, int]) -> List[List[int]]:
+    def _shrink_to_initial_set(self, members: int, active: int) -> int:
         """
-        Translates the properties of admissibility into a CNF formula for the SAT solver.
-        Variables are positive for 'in' the set.
+        Minimal non-empty admissible subset of the admissible bitset members. A proper
+        admissible subset is looked for as the largest admissible subset of members
+        without a, for each a; the set is conflict-free, so these are closed under union.
         """
-        clauses = []
-        
+        shrunk = True
+        while shrunk and members & (members - 1):
+            shrunk = False
+            for a in self._iter_bits(members):
+                smaller = self._largest_admissible_subset(members & ~(1 << a), active)
+                if smaller:
+                    members = smaller
+                    shrunk = True
+                    break
+        return members
+
+    def _largest_admissible_subset(self, members: int, active: int) -> int:
+        """
+        Largest admissible subset of the conflict-free bitset members in the reduct
+        induced by active, obtained by repeatedly dropping the members that have an
+        attacker not attacked by the remaining ones.
+        """
+        while members:
+            defeated = self._get_attacked_set(members)
+            undefended = 0
+            for a in self._iter_bits(members):
+                if self._attackers[a] & active & ~defeated:
+                    undefended |= 1 << a
+            if not undefended:
+                break
+            members &= ~undefended
+        return members
+
+    def _encode_admissible(self) -> List[List[int]]:
+        """
+        Translates the properties of admissibility into a CNF formula for the SAT solver,
+        relative to existence variables. For the argument at position i, variable i+1
+        states that it is in the set and N+i+1 that it exists in the current reduct.
+        """
+        N = len(self.arguments)
+        in_vars = np.arange(1, N + 1)
+        self_attacking = np.array([self._self_attacking >> i & 1 for i in range(N)], dtype=bool)
+
+        # Only existing arguments can be in the set.
+        clauses = np.column_stack((-in_vars, in_vars + N)).tolist()
+        # A self-attacking argument is never in an admissible set, which a unit clause
+        # states directly; it needs no conflict-freeness or defence clauses of its own.
+        clauses.extend((-in_vars[self_attacking, None]).tolist())
+
         # 1. Conflict-Freeness: If 'a' attacks 'b', 'a' and 'b' cannot both be in.
-        for a, b in graph.edges:
-            if a in arg_map and b in arg_map:
-                clauses.append([-arg_map[a], -arg_map[b]])
+        edges = self._edges[~self_attacking[self._edges[:, 0]] & ~self_attacking[self._edges[:, 1]]]
+        clauses.extend((-(edges + 1)).tolist())
 
         # 2. Admissibility (Defense): If an argument 'a' is in, it must be defended.
-        for a in graph.nodes:
-            if a not in arg_map: continue
-            attackers = list(graph.predecessors(a))
-            if not attackers: continue
-
-            for b in attackers:
-                defenders = list(graph.predecessors(b))
-                # Clause: (¬I_a) ∨ (I_c1 ∨ I_c2 ∨ ...)
-                # If 'a' is in, at least one of its defenders against 'b' must be in.
-                clause = [-arg_map[a]] + [arg_map[c] for c in defenders if c in arg_map]
-                clauses.append(clause)
-        
+        defender_vars = [(self._predecessors(b) + 1).tolist() for b in range(N)]
+        for b, a in self._edges[~self_attacking[self._edges[:, 1]]].tolist():
+            # Clause: (¬I_a) ∨ ¬E_b ∨ (I_c1 ∨ I_c2 ∨ ...)
+            # If 'a' is in and 'b' exists, at least one of its defenders against 'b' must be in.
+            clauses.append([-(a + 1), -(N + b + 1)] + defender_vars[b])
+
+        # The set must be non-empty; absent and self-attacking arguments are never in it.
+        clauses.append(in_vars[~self_attacking].tolist())
         return clauses
 
     def get_serialisation_indices(self) -> Dict[str, float]:
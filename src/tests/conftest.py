@@ -5,21 +5,24 @@ import os
 import networkx as nx
 from util.af_parser import parse_af_file
 
-@pytest.fixture(scope="module")
+# The semantics never modify the frameworks they are given, so every fixture is
+# built once and shared by all tests.
+
+@pytest.fixture(scope="session")
 def af_ex_framework():
-    """A pytest fixture that loads the AF_ex framework once per test module."""
+    """A pytest fixture that loads the AF_ex framework once per test session."""
     af_file_path = os.path.join("data", "AF_ex.af")
     graph = parse_af_file(af_file_path)
     return graph
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def single_arg_framework():
     """Creates a very simple framework with only one argument '1'."""
     graph = nx.DiGraph()
     graph.add_node("1")
     return graph
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def simple_attack_framework():
     """Creates a simple framework with one attack: 1 -> 2."""
     graph = nx.DiGraph()
@@ -27,7 +30,7 @@ def simple_attack_framework():
     return graph
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mutual_attack_framework():
     """Creates a framework with two mutually attacking arguments."""
     graph = nx.DiGraph()
@@ -35,7 +38,7 @@ def mutual_attack_framework():
     graph.add_edge("2", "1")
     return graph
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def three_cycle_framework():
     """Creates a framework with a 3-argument cycle (1->2, 2->3, 3->1)."""
     graph = nx.DiGraph()
@@ -44,14 +47,14 @@ def three_cycle_framework():
     graph.add_edge("3", "1")
     return graph
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def self_attack_framework():
     """Creates a framework with a single self-attacking argument."""
     graph = nx.DiGraph()
     graph.add_edge("1", "1")
     return graph
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def defense_chain_framework():
     """Creates a simple defense chain: 1 -> 2 -> 3."""
     graph = nx.DiGraph()
@@ -59,7 +62,7 @@ def defense_chain_framework():
     graph.add_edge("2", "3")
     return graph
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def split_defense_framework():
     """
     Creates a framework where two arguments defend a fourth:
@@ -73,3 +76,18 @@ def split_defense_framework():
     graph.add_edge("3", "4")
     graph.add_edge("4", "3")
     return graph
+
+@pytest.fixture(scope="session")
+def multi_component_framework():
+    """
+    Creates a framework with several strongly connected components and disjoint
+    ancestor closures: 1<->2 attacks the cycle 3<->4, which attacks 5;
+    6<->7 is a separate component, 8 attacks itself and 9, and 10 is isolated.
+    """
+    graph = nx.DiGraph()
+    graph.add_edges_from([
+        ("1", "2"), ("2", "1"), ("2", "3"), ("3", "4"), ("4", "3"), ("4", "5"),
+        ("6", "7"), ("7", "6"), ("8", "8"), ("8", "9")
+    ])
+    graph.add_node("10")
+    return graph
@@ -0,0 +1,24 @@
+# tests/test_af_files.py
+
+import os
+from util.af_files import iter_af_files
+
+def test_iter_af_files_finds_nested_frameworks(tmp_path):
+    """
+    Tests that .af files in nested directories are found, other files are
+    skipped, and symlinked directories are not followed.
+    """
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "top.af").write_text("p af 1\n")
+    (tmp_path / "a" / "b" / "deep.af").write_text("p af 1\n")
+    (tmp_path / "a" / "notes.txt").write_text("")
+    os.symlink(tmp_path / "a", tmp_path / "link")
+
+    found = sorted(os.path.relpath(path, tmp_path) for path in iter_af_files(str(tmp_path)))
+    assert found == ["a/b/deep.af".replace("/", os.sep), "top.af"]
+
+def test_iter_af_files_skips_missing_directories(tmp_path):
+    """
+    Tests that a directory that cannot be listed yields nothing.
+    """
+    assert list(iter_af_files(str(tmp_path / "missing"))) == []
@@ -0,0 +1,59 @@
+# tests/test_af_parser.py
+
+import pytest
+from util.af_parser import parse_af_file, parse_af_edges
+
+@pytest.mark.parametrize("content, expected_nodes, expected_edges", [
+    # Without a p-line, the arguments are the ones named by the attacks.
+    ("1 2\n2 3\n", ['1', '2', '3'], [('1', '2'), ('2', '3')]),
+    # Comment lines before, between and after the attacks.
+    ("# header\np af 3\n# attacks\n1 2\n# middle\n2 3\n# end\n",
+     ['1', '2', '3'], [('1', '2'), ('2', '3')]),
+    # A blank trailing line, and an argument without attacks.
+    ("p af 4\n1 2\n2 3\n\n", ['1', '2', '3', '4'], [('1', '2'), ('2', '3')]),
+    # Repeated attacks are kept once, in the order they first appear.
+    ("p af 3\n2 3\n1 2\n2 3\n1 2\n", ['1', '2', '3'], [('2', '3'), ('1', '2')]),
+    # Malformed rows make the vectorized reader fall back, which skips them.
+    ("p af 3\n1 2\n2 3 1\nfoo\n3 1\n", ['1', '2', '3'], [('1', '2'), ('3', '1')]),
+    # So do attacks on arguments beyond the p-line, which are added.
+    ("p af 2\n1 2\n2 3\n", ['1', '2', '3'], [('1', '2'), ('2', '3')]),
+    # An empty attack block.
+    ("p af 2\n", ['1', '2'], []),
+])
+def test_parsers_agree_on_af_files(tmp_path, content, expected_nodes, expected_edges):
+    """
+    Tests that parse_af_file and parse_af_edges read the same arguments and
+    attacks from files that exercise both the vectorized reader and its fallback.
+    """
+    file_path = tmp_path / "framework.af"
+    file_path.write_text(content)
+
+    graph = parse_af_file(str(file_path))
+    assert list(graph.nodes) == expected_nodes
+    assert sorted(graph.edges) == sorted(expected_edges)
+
+    arguments, attackers, attacked = parse_af_edges(str(file_path))
+    assert arguments == list(graph.nodes)
+    assert attackers.dtype.kind == attacked.dtype.kind == 'i'
+    edges = [(arguments[u], arguments[v]) for u, v in zip(attackers.tolist(), attacked.tolist())]
+    assert sorted(edges) == sorted(expected_edges)
+    assert len(edges) == len(set(edges))
+
+def test_parse_af_edges_keeps_file_order(tmp_path):
+    """
+    Tests that parse_af_edges lists the distinct attacks in file order.
+    """
+    file_path = tmp_path / "framework.af"
+    file_path.write_text("p af 3\n3 1\n2 3\n3 1\n1 2\n")
+    arguments, attackers, attacked = parse_af_edges(str(file_path))
+    edges = [(arguments[u], arguments[v]) for u, v in zip(attackers.tolist(), attacked.tolist())]
+    assert edges == [('3', '1'), ('2', '3'), ('1', '2')]
+
+def test_parse_af_file_rejects_invalid_p_line(tmp_path):
+    """
+    Tests that a p-line without a valid number of arguments is an error.
+    """
+    file_path = tmp_path / "framework.af"
+    file_path.write_text("p af x\n1 2\n")
+    with pytest.raises(ValueError, match="Invalid p-line format"):
+        parse_af_file(str(file_path))
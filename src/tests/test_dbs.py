@@ -1,7 +1,11 @@
 # test/test_dbs.py
 
 import os
+import pytest
+import networkx as nx
+import numpy as np
 from util.af_parser import parse_af_file
+from semantics import dbs
 from semantics.dbs import Dbs
 
 def test_dbs_ranking_on_AF_ex(af_ex_framework):
@@ -28,4 +32,54 @@ def test_dbs_vectors_on_AF_ex(af_ex_framework):
         '7': [1, -2, 3, -1, 2],
         '8': [2, -3, 1, -2, 3]
     }
-    assert calculated_vectors == expected_vectors
\ No newline at end of file
+    assert calculated_vectors == expected_vectors
+
+
+def test_dbs_float64_fallback_matches_int64(af_ex_framework, monkeypatch):
+    # A tiny PATH_COUNT_LIMIT forces the path counts into float64 after the
+    # first columns; the counts are small, so nothing may change.
+    expected = Dbs(af_ex_framework, max_path_length=8, early_exit=False)
+    monkeypatch.setattr(dbs, "PATH_COUNT_LIMIT", 4)
+    promoted = Dbs(af_ex_framework, max_path_length=8, early_exit=False)
+    assert promoted._vectors.dtype == np.float64
+    assert promoted.get_ranking() == expected.get_ranking()
+    assert promoted.get_discussion_vectors() == expected.get_discussion_vectors()
+
+def test_dbs_stops_before_float64_saturates():
+    # In a complete framework of 40 arguments, 39^k paths of length k exceed the
+    # float64 range after about 190 steps; those columns must not be compared.
+    af = nx.complete_graph(40, create_using=nx.DiGraph)
+    af = nx.relabel_nodes(af, {i: str(i + 1) for i in range(40)})
+    af.remove_edge('1', '2')
+    with pytest.warns(RuntimeWarning, match="exceed the float64 range"):
+        dbs_full = Dbs(af, max_path_length=300, early_exit=False)
+    assert np.isfinite(dbs_full._vectors).all()
+    assert dbs_full._vectors[:, 150].all() and not dbs_full._vectors[:, 250:].any()
+
+def test_dbs_stops_once_all_vectors_differ(defense_chain_framework):
+    # In 1->2->3 every argument has its own vector after two path lengths, so the
+    # remaining columns are only filled when the vectors are requested.
+    dbs_early = Dbs(defense_chain_framework, max_path_length=6)
+    dbs_full = Dbs(defense_chain_framework, max_path_length=6, early_exit=False)
+    assert dbs_early._next_path_length <= 3
+    assert dbs_early.get_ranking() == dbs_full.get_ranking() == [{'1'}, {'3'}, {'2'}]
+    assert dbs_early.get_discussion_vectors() == dbs_full.get_discussion_vectors()
+
+@pytest.mark.parametrize("framework_name", [
+    "af_ex_framework", "single_arg_framework", "simple_attack_framework",
+    "mutual_attack_framework", "three_cycle_framework", "self_attack_framework",
+    "defense_chain_framework", "split_defense_framework", "multi_component_framework"
+])
+def test_dbs_early_exit_keeps_ranking(framework_name, request):
+    # Stopping once the prefix classes are equitable must not change the ranking.
+    af = request.getfixturevalue(framework_name)
+    assert Dbs(af).get_ranking() == Dbs(af, early_exit=False).get_ranking()
+
+def test_dbs_early_exit_keeps_ranking_on_cyclic_frameworks():
+    # Random frameworks with cycles and self-attacks. In some of them a path
+    # length splits no class although the classes are not yet equitable.
+    for seed in range(200):
+        af = nx.gnp_random_graph(14, 0.2, seed=seed, directed=True)
+        af = nx.relabel_nodes(af, {i: str(i + 1) for i in range(14)})
+        af.add_edge('1', '1')
+        assert Dbs(af).get_ranking() == Dbs(af, early_exit=False).get_ranking(), seed
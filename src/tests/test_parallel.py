@@ -0,0 +1,24 @@
+# tests/test_parallel.py
+
+import multiprocessing
+import os
+from util.parallel import resolve_n_jobs
+
+def test_resolve_n_jobs_caps_at_num_tasks():
+    """
+    Tests that the number of processes never exceeds the number of tasks and
+    is at least 1, and that -1 stands for every core.
+    """
+    assert resolve_n_jobs(4, 10) == 4
+    assert resolve_n_jobs(4, 3) == 3
+    assert resolve_n_jobs(4, 0) == 1
+    assert resolve_n_jobs(0, 10) == 1
+    assert resolve_n_jobs(-1, 1 << 20) == (os.cpu_count() or 1)
+
+def test_resolve_n_jobs_inside_daemonic_workers():
+    """
+    Tests that daemonic processes, which cannot start processes of their own,
+    always keep the work in-process.
+    """
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        assert pool.apply_async(resolve_n_jobs, (4, 10)).get(timeout=60) == 1
@@ -1,8 +1,13 @@
 # tests/test_prob_complete.py
 
+import pickle
 import pytest
 import networkx as nx
+import numpy as np
+from semantics.prob import prob_complete, prob_ideal
 from semantics.prob.prob_complete import ProbComplete
+from semantics.prob.prob_ideal import ProbIdeal
+from semantics.prob.prob_preferred import ProbPreferred
 
 # =============================================================================
 # Unit Tests for the core extension-finding logic
@@ -87,4 +92,46 @@ def test_prob_complete_scores_on_AF_ex(af_ex_framework):
         '7': 0.3166,
         '8': 0.3088
     }
-    assert scores == pytest.approx(expected_scores, rel=0.1)
\ No newline at end of file
+    assert scores == pytest.approx(expected_scores, rel=0.1)
+
+# =============================================================================
+# Consistency of the SAT path with the labelling path
+# =============================================================================
+
+@pytest.mark.parametrize("framework_name", [
+    "af_ex_framework", "mutual_attack_framework", "three_cycle_framework",
+    "split_defense_framework", "self_attack_framework"
+])
+def test_sat_path_matches_labelling_path(framework_name, request, monkeypatch):
+    """
+    Subgraphs of at most LABELLING_MAX_ARGS arguments are labelled by backtracking,
+    so the fixtures never reach the incremental SAT solver on their own. Forcing
+    every subgraph onto the SAT path (with frequent solver rebuilds) must yield the
+    same complete, preferred and ideal extensions on every induced subgraph.
+    """
+    af = request.getfixturevalue(framework_name)
+    semantics_classes = [ProbComplete, ProbPreferred, ProbIdeal]
+    subgraphs = range(1, 1 << af.number_of_nodes())
+    expected = [[set(sem._find_extensions_in_mask(active)) for active in subgraphs]
+                for sem in (sem_class(af) for sem_class in semantics_classes)]
+
+    monkeypatch.setattr(prob_complete, "LABELLING_MAX_ARGS", 0)
+    monkeypatch.setattr(prob_ideal, "LABELLING_MAX_ARGS", 0)
+    monkeypatch.setattr(prob_complete, "SOLVER_REBUILD_INTERVAL", 3)
+    for sem_class, expected_extensions in zip(semantics_classes, expected):
+        sem = sem_class(af)
+        assert [set(sem._find_extensions_in_mask(active)) for active in subgraphs] == expected_extensions
+
+def test_prob_complete_workers_receive_no_graph_or_memo(af_ex_framework):
+    """
+    Monte Carlo workers receive a pickled copy of the semantics without the
+    DiGraph, the memoized subgraphs or the solver, and sample the same counts.
+    """
+    prob = ProbComplete(af_ex_framework)
+    counts = prob._run_chunk(np.random.SeedSequence(0), 200)
+    assert prob._accepted_cache
+    worker_copy = pickle.loads(pickle.dumps(prob))
+    assert worker_copy.af is None
+    assert worker_copy._accepted_cache == {}
+    assert worker_copy._solver is None
+    assert np.array_equal(worker_copy._run_chunk(np.random.SeedSequence(0), 200), counts)
@@ -1,9 +1,33 @@
 # tests/test_prob_grounded.py
 
+import itertools
 import pytest
 import networkx as nx
+from semantics.prob import prob_grounded
 from semantics.prob.prob_grounded import ProbGrounded
 
+def brute_force_grounded_scores(af: nx.DiGraph, p: float) -> dict:
+    """
+    Probability of every argument being in the grounded extension, summed over
+    all 2^n induced subgraphs, with the grounded extension computed as the least
+    fixpoint of the characteristic function.
+    """
+    nodes = list(af.nodes)
+    scores = dict.fromkeys(nodes, 0.0)
+    for kept in itertools.product([False, True], repeat=len(nodes)):
+        active = {node for node, keep in zip(nodes, kept) if keep}
+        accepted = set()
+        while True:
+            defeated = {v for u in accepted for v in af.successors(u)}
+            defended = {a for a in active if all(b in defeated for b in af.predecessors(a) if b in active)}
+            if defended == accepted:
+                break
+            accepted = defended
+        subgraph_prob = p ** len(active) * (1 - p) ** (len(nodes) - len(active))
+        for node in accepted:
+            scores[node] += subgraph_prob
+    return scores
+
 def test_prob_grounded_extensions_on_simple_attack(simple_attack_framework):
     """
     Tests that for 1->2, the grounded extension is {1}.
@@ -65,4 +89,29 @@ def test_prob_grounded_scores_on_AF_ex(af_ex_framework):
         '7': 80 / 256,   # 0.3125
         '8': 80 / 256    # 0.3125
     }
-    assert scores == pytest.approx(expected_scores, rel=0.1)
\ No newline at end of file
+    assert scores == pytest.approx(expected_scores, rel=0.1)
+
+def test_prob_grounded_python_closures_match_brute_force(multi_component_framework, monkeypatch):
+    """
+    The exact path enumerates the subsets of each component's ancestor closure
+    instead of all 2^n subgraphs. Without the compiled kernels, this must give
+    the same scores as plain enumeration on a framework with several components.
+    """
+    monkeypatch.setattr(prob_grounded, "_grounded_fixpoint", None)
+    monkeypatch.setattr(prob_grounded, "_closure_scores", None)
+    prob = ProbGrounded(multi_component_framework, p=0.3)
+    assert len(prob._ancestor_groups()) > 1
+    expected_scores = brute_force_grounded_scores(multi_component_framework, p=0.3)
+    assert prob.get_scores() == pytest.approx(expected_scores)
+
+@pytest.mark.skipif(prob_grounded._closure_scores is None, reason="numba is not installed")
+@pytest.mark.parametrize("framework_name", ["multi_component_framework", "af_ex_framework"])
+def test_prob_grounded_compiled_closures_match_brute_force(framework_name, request):
+    """
+    The compiled kernel enumerates each ancestor closure in parallel chunks split
+    on its highest bits; its exact scores must match plain enumeration.
+    """
+    af = request.getfixturevalue(framework_name)
+    prob = ProbGrounded(af, p=0.3)
+    expected_scores = brute_force_grounded_scores(af, p=0.3)
+    assert prob.get_scores() == pytest.approx(expected_scores)
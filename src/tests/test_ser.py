@@ -1,10 +1,45 @@
 # test/test_ser.py
 
 import os
+import pytest
 import math  # Required for math.inf
+import networkx as nx
 from util.af_parser import parse_af_file
 from semantics.ser import Ser
 
+def brute_force_initial_sets(af: nx.DiGraph, active: set) -> set:
+    """
+    Initial sets of the reduct induced by active, i.e. its minimal non-empty
+    admissible sets, found by checking every subset.
+    """
+    nodes = sorted(active)
+    admissible = []
+    for mask in range(1, 1 << len(nodes)):
+        members = {node for i, node in enumerate(nodes) if mask >> i & 1}
+        attacked = {v for u in members for v in af.successors(u)}
+        if members & attacked:
+            continue
+        if all(b in attacked for a in members for b in af.predecessors(a) if b in active):
+            admissible.append(frozenset(members))
+    return {s for s in admissible if not any(t < s for t in admissible)}
+
+def ser_initial_sets(ser: Ser, active: set) -> set:
+    """Initial sets found by the SAT search of ser, as sets of arguments."""
+    mask = sum(1 << ser.arg_to_index[arg] for arg in active)
+    return {frozenset(ser.arguments[i] for i in ser._iter_bits(s)) for s in ser._find_initial_sets_sat(mask)}
+
+@pytest.fixture(scope="module")
+def two_argument_initial_sets_framework():
+    """
+    1 and 2 defend each other (3->1, 2->3, 4->2, 1->4), as do 3 and 4, so the
+    initial sets {1, 2} and {3, 4} have two arguments. 1 also defends 7 against
+    8, so {1, 2, 7} is admissible but not initial; 5 attacks 6.
+    """
+    graph = nx.DiGraph()
+    graph.add_edges_from([("3", "1"), ("2", "3"), ("4", "2"), ("1", "4"),
+                          ("8", "7"), ("1", "8"), ("5", "6")])
+    return graph
+
 def test_ser_ranking_on_AF_ex(af_ex_framework):
     """
     Tests the final Ser ranking on the AF_ex.af file.
@@ -39,4 +74,81 @@ def test_ser_indices_on_AF_ex(af_ex_framework):
         '7': math.inf,
         '8': 2
     }
-    assert calculated_indices == expected_indices, "Serialisation indices do not match expected scores."
\ No newline at end of file
+    assert calculated_indices == expected_indices, "Serialisation indices do not match expected scores."
+
+def test_ser_releases_solver_without_initial_sets(self_attack_framework):
+    """
+    A framework without initial sets returns early; the solver used to find
+    that out must still be deleted.
+    """
+    ser = Ser(self_attack_framework)
+    assert ser._solver is None
+
+def test_ser_shrinks_admissible_models_to_initial_sets(two_argument_initial_sets_framework):
+    """
+    A non-minimal admissible set is shrunk to an initial set inside it.
+    """
+    ser = Ser(two_argument_initial_sets_framework)
+    full = (1 << len(ser.arguments)) - 1
+    members = sum(1 << ser.arg_to_index[arg] for arg in ["1", "2", "7"])
+    shrunk = ser._shrink_to_initial_set(members, full)
+    assert {ser.arguments[i] for i in ser._iter_bits(shrunk)} == {"1", "2"}
+
+def test_ser_initial_sets_from_large_models_match_brute_force(two_argument_initial_sets_framework, monkeypatch):
+    """
+    With the solver preferring to put arguments in, its models are large
+    admissible sets that must be shrunk; the initial sets of every reduct must
+    still match plain enumeration.
+    """
+    af = two_argument_initial_sets_framework
+    ser = Ser(af)
+    start_solver_call = Ser._start_solver_call
+
+    def start_solver_call_preferring_in(self, is_active):
+        solver, selector, exists_assumptions = start_solver_call(self, is_active)
+        solver.set_phases(list(range(1, len(self.arguments) + 1)))
+        return solver, selector, exists_assumptions
+
+    shrunk_models = []
+    shrink_to_initial_set = Ser._shrink_to_initial_set
+
+    def recording_shrink(self, members, active):
+        initial_set = shrink_to_initial_set(self, members, active)
+        if initial_set != members:
+            shrunk_models.append(members)
+        return initial_set
+
+    monkeypatch.setattr(Ser, "_start_solver_call", start_solver_call_preferring_in)
+    monkeypatch.setattr(Ser, "_shrink_to_initial_set", recording_shrink)
+    nodes = sorted(af.nodes)
+    for mask in range(1, 1 << len(nodes)):
+        active = {node for i, node in enumerate(nodes) if mask >> i & 1}
+        assert ser_initial_sets(ser, active) == brute_force_initial_sets(af, active), active
+    assert shrunk_models
+
+def test_ser_singleton_initial_sets_match_brute_force(monkeypatch):
+    """
+    Singleton initial sets are collected without solving: 5 is unattacked, 6
+    and 7 defend themselves against each other and 6 also against the
+    self-attacking 8. Next to the initial sets {1, 2} and {3, 4}, the initial
+    sets of every reduct must match plain enumeration, and the solver must
+    never be left to find a singleton.
+    """
+    af = nx.DiGraph()
+    af.add_edges_from([("3", "1"), ("2", "3"), ("4", "2"), ("1", "4"), ("5", "8"),
+                       ("6", "7"), ("7", "6"), ("8", "8"), ("8", "6"), ("6", "8")])
+    ser = Ser(af)
+    models = []
+    shrink_to_initial_set = Ser._shrink_to_initial_set
+
+    def recording_shrink(self, members, active):
+        models.append(members)
+        return shrink_to_initial_set(self, members, active)
+
+    monkeypatch.setattr(Ser, "_shrink_to_initial_set", recording_shrink)
+    nodes = sorted(af.nodes)
+    for mask in range(1, 1 << len(nodes)):
+        active = {node for i, node in enumerate(nodes) if mask >> i & 1}
+        assert ser_initial_sets(ser, active) == brute_force_initial_sets(af, active), active
+    assert models and all(members & (members - 1) for members in models)
+    assert [sorted(group) for group in ser.get_ranking()] == [['1', '2', '3', '4', '5', '6', '7'], ['8']]
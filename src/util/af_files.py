@@ -0,0 +1,21 @@
+# util/af_files.py
+
+import os
+
+def iter_af_files(dir_path: str):
+    """
+    Yields the .af files below dir_path. The DirEntry objects of os.scandir
+    already know their type, so no file is stat'ed separately.
+    """
+    try:
+        entries = list(os.scandir(dir_path))
+    except OSError:
+        # Unreadable directories are skipped, as os.walk does.
+        return
+    for entry in entries:
+        if entry.is_dir():
+            # Symlinked directories are not followed.
+            if not entry.is_symlink():
+                yield from iter_af_files(entry.path)
+        elif entry.name.endswith(".af"):
+            yield entry.path
@@ -1,6 +1,9 @@
 # util/af_parser.py
 
+import warnings
+
 import networkx as nx
+import numpy as np
 
 def parse_af_file(file_path: str) -> nx.DiGraph:
     """
@@ -22,35 +25,122 @@ def parse_af_file(file_path: str) -> nx.DiGraph:
 
     try:
         with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-
-                # Skip empty lines or comments
-                if not line or line.startswith('#'):
-                    continue
-
-                #Handle the p-line
-                if line.startswith('p af'):
-                    try:
-                        num_args = int(line.split()[2])
-                        # Add all arguments as nodes. We use strings for node labels
-                        # to avoid potential confusion with 0-based list indexing.
-                        graph.add_nodes_from([str(i) for i in range(1, num_args + 1)])
-                    except (IndexError, ValueError):
-                        raise ValueError(f"Invalid p-line format: {line}")
-                    
-                # Handle attack lines
-                else:
-                    try:
-                        attacker, attacked = line.split()
-                        # add_edge will automatically add nodes if they don't exist,
-                        # but parsing the p-line first is good practice.
-                        graph.add_edge(attacker, attacked)
-                    except ValueError:
-                        print(f"Warning: Skipping malformed attack line: {line}")
+            num_args = _read_p_line(f)
+            if num_args is not None:
+                # Add all arguments as nodes. We use strings for node labels
+                # to avoid potential confusion with 0-based list indexing.
+                labels = [str(i) for i in range(num_args + 1)]
+                graph.add_nodes_from(labels[1:])
+                block_start = f.tell()
+                attacks = _read_attack_block(f, num_args)
+                if attacks is not None:
+                    graph.add_edges_from(zip([labels[i] for i in attacks[:, 0].tolist()],
+                                             [labels[i] for i in attacks[:, 1].tolist()]))
+                    return graph
+                f.seek(block_start)
+            else:
+                f.seek(0)
+            _parse_lines(f, graph)
 
     except FileNotFoundError:
         print(f"Error: File not found at {file_path}")
         return graph # Return an empty graph
 
-    return graph
\ No newline at end of file
+    return graph
+
+def parse_af_edges(file_path: str) -> tuple:
+    """
+    Parses an .af file like parse_af_file, but without building a DiGraph.
+
+    Returns:
+        A tuple (arguments, attackers, attacked): the argument labels in the
+        node order of parse_af_file, and two integer arrays holding, for every
+        distinct attack in file order, the positions of its attacker and of the
+        attacked argument in arguments.
+    """
+    try:
+        with open(file_path, 'r') as f:
+            num_args = _read_p_line(f)
+            attacks = _read_attack_block(f, num_args) if num_args is not None else None
+    except FileNotFoundError:
+        attacks = None
+
+    if attacks is None:
+        # Files the vectorized reader does not handle go through the DiGraph parser.
+        graph = parse_af_file(file_path)
+        arguments = list(graph.nodes)
+        node_index = {arg: i for i, arg in enumerate(arguments)}
+        num_attacks = graph.number_of_edges()
+        attackers = np.fromiter((node_index[u] for u, _ in graph.edges), dtype=np.int64, count=num_attacks)
+        attacked = np.fromiter((node_index[v] for _, v in graph.edges), dtype=np.int64, count=num_attacks)
+        return arguments, attackers, attacked
+
+    # Repeated attack lines are dropped, as the DiGraph does, keeping the first
+    # occurrence of each so that the attacks stay in file order.
+    attackers, attacked = attacks[:, 0] - 1, attacks[:, 1] - 1
+    _, first = np.unique(attackers * num_args + attacked, return_index=True)
+    first.sort()
+    return [str(i) for i in range(1, num_args + 1)], attackers[first], attacked[first]
+
+def _read_p_line(f) -> int | None:
+    """
+    Reads up to the first line that is neither empty nor a comment and returns
+    the number of arguments if it is the p-line, or None otherwise.
+    """
+    for line in iter(f.readline, ''):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if not line.startswith('p af'):
+            return None
+        try:
+            return int(line.split()[2])
+        except (IndexError, ValueError):
+            raise ValueError(f"Invalid p-line format: {line}")
+    return None
+
+def _read_attack_block(f, num_args: int) -> np.ndarray | None:
+    """
+    Reads all remaining lines of f as attacks between the arguments 1..num_args
+    in a single vectorized pass. Returns an (m, 2) integer array, or None if any
+    line is not such an attack, in which case the caller falls back to _parse_lines.
+    """
+    try:
+        with warnings.catch_warnings():
+            # An empty attack block is valid and needs no warning.
+            warnings.simplefilter('ignore', UserWarning)
+            attacks = np.loadtxt(f, dtype=np.int64, comments='#', ndmin=2)
+    except ValueError:
+        return None
+    if attacks.size == 0:
+        return attacks.reshape(0, 2)
+    if attacks.shape[1] != 2 or attacks.min() < 1 or attacks.max() > num_args:
+        return None
+    return attacks
+
+def _parse_lines(f, graph: nx.DiGraph) -> None:
+    """Line-by-line parser for files that do not consist of a p-line followed by attacks."""
+    for line in f:
+        line = line.strip()
+
+        # Skip empty lines or comments
+        if not line or line.startswith('#'):
+            continue
+
+        #Handle the p-line
+        if line.startswith('p af'):
+            try:
+                num_args = int(line.split()[2])
+                graph.add_nodes_from([str(i) for i in range(1, num_args + 1)])
+            except (IndexError, ValueError):
+                raise ValueError(f"Invalid p-line format: {line}")
+
+        # Handle attack lines
+        else:
+            try:
+                attacker, attacked = line.split()
+                # add_edge will automatically add nodes if they don't exist,
+                # but parsing the p-line first is good practice.
+                graph.add_edge(attacker, attacked)
+            except ValueError:
+                print(f"Warning: Skipping malformed attack line: {line}")
@@ -0,0 +1,18 @@
+# util/parallel.py
+
+import multiprocessing
+import os
+
+def resolve_n_jobs(n_jobs: int, num_tasks: int) -> int:
+    """
+    Number of worker processes to share num_tasks independent tasks: n_jobs,
+    where -1 uses every core, capped at num_tasks and at least 1.
+
+    Daemonic processes, such as multiprocessing.Pool workers, cannot start
+    processes of their own, so inside them the work always stays in-process.
+    """
+    if multiprocessing.current_process().daemon:
+        return 1
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    return max(1, min(n_jobs, num_tasks))
@@ -0,0 +1,5 @@
+# util/sat.py
+
+# Persistent incremental SAT solvers are rebuilt after this many calls, so that
+# retired blocking clauses and their selector variables do not accumulate.
+SOLVER_REBUILD_INTERVAL = 256